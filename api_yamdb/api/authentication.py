@@ -0,0 +1,69 @@
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed, InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.models import User
+from reviews.revocation import revocations
+from reviews.user_cache import user_cache
+from .tokens import ISSUED_CLAIM, ROLE_CLAIM, STAFF_CLAIM
+
+
+def load_user(user_id):
+    try:
+        user = user_cache.get(user_id)
+    except User.DoesNotExist:
+        raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    if not user.is_active:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    return user
+
+
+class TokenClaimsUser(SimpleLazyObject):
+    """Пользователь, права которого известны из утверждений токена.
+
+    Запись пользователя загружается из `user_cache` только при обращении
+    к остальным полям.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+
+    def __init__(self, user_id, role, is_staff):
+        super().__init__(lambda: load_user(user_id))
+        # Запись в __dict__ в обход LazyObject.__setattr__,
+        # который загрузил бы пользователя.
+        self.__dict__.update(
+            id=user_id, pk=user_id, role=role, is_staff=is_staff
+        )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        if ROLE_CLAIM not in validated_token:
+            # Токены, выпущенные без роли, проверяются по записи.
+            return load_user(user_id)
+        # Удаление пользователя или смена его прав отзывают
+        # выпущенные раньше токены, запись для этого не нужна.
+        revoked_at = revocations.revoked_at(user_id)
+        if revoked_at is not None and (
+            validated_token.get(ISSUED_CLAIM, 0) < revoked_at
+        ):
+            raise AuthenticationFailed(
+                _('Token is invalid or expired'), code='token_revoked'
+            )
+        return TokenClaimsUser(
+            user_id,
+            validated_token[ROLE_CLAIM],
+            validated_token.get(STAFF_CLAIM, False),
+        )
@@ -0,0 +1,91 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from reviews.versions import get_versions
+
+RESPONSE_KEY = 'response:{url}:{versions}'
+ETAG = '{url}:{media_type}:{versions}'
+
+
+class VersionedCacheMixin:
+    """Кэширует ответы анонимным GET-запросам.
+
+    Ключ содержит адрес с параметрами и версии моделей `cache_models`,
+    поэтому любое их изменение делает старые ответы недоступными.
+    """
+    cache_models = ()
+
+    def get_response_key(self, request):
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        versions = get_versions(*self.cache_models)
+        return RESPONSE_KEY.format(
+            url=url, versions='.'.join(str(version) for version in versions)
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = caches[settings.RESPONSE_CACHE]
+        key = self.get_response_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class VersionedCacheRetrieveMixin(VersionedCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на If-None-Match.
+
+    ETag строится по адресу и версиям моделей `validator_models`
+    без обращения к базе и сериализации. Last-Modified не выдаётся:
+    с точностью до секунды он подтвердил бы изменение в ту же секунду.
+    """
+    validator_models = ()
+
+    def get_etag(self, request):
+        versions = get_versions(*self.validator_models)
+        etag = hashlib.md5(ETAG.format(
+            url=request.build_absolute_uri(),
+            media_type=request.accepted_media_type,
+            versions='.'.join(str(version) for version in versions),
+        ).encode()).hexdigest()
+        return quote_etag(etag)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
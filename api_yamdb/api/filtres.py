@@ -1,22 +1,85 @@
+from django.db.models import Q
 from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 from reviews.models import Title
+from reviews.search import SEARCH_RANK, search_titles
+from reviews.title_index import filter_by_ids, title_index
+
+INDEXED_FIELDS = ('genre', 'category', 'year')
+# Больше любого символа: строки с префиксом лежат в [префикс, префикс + MAX].
+MAX_CHAR = chr(0x10FFFF)
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
-    name = filters.CharFilter(
-        field_name='name',
-        lookup_expr='contains'
-    )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='contains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='contains'
-    )
+    name = filters.CharFilter(method='filter_name')
+    category = CharInFilter(method='filter_indexed')
+    genre = CharInFilter(method='filter_indexed')
+    year = NumberInFilter(method='filter_indexed')
 
     class Meta:
         model = Title
         fields = ['name', 'genre', 'category', 'year']
+
+    def filter_queryset(self, queryset):
+        values = {
+            field: self.form.cleaned_data[field]
+            for field in INDEXED_FIELDS
+            if self.form.cleaned_data.get(field)
+        }
+        if 'year' in values:
+            values['year'] = [int(year) for year in values['year']]
+        if values:
+            queryset = filter_by_ids(queryset, title_index.match(**values))
+        return super().filter_queryset(queryset)
+
+    def filter_name(self, queryset, name, value):
+        return search_titles(queryset, value, column='name')
+
+    def filter_indexed(self, queryset, name, value):
+        # Жанр, категория и год уже отфильтрованы индексом
+        # в filter_queryset одним пересечением.
+        return queryset
+
+
+class TitleSearchFilter(SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        return search_titles(queryset, text)
+
+
+class UserSearchFilter(SearchFilter):
+    """Поиск по началу username или email без учёта регистра.
+
+    Префикс ищется диапазоном по индексированным копиям полей
+    в нижнем регистре: LIKE в SQLite индекс не использует.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for term in self.get_search_terms(request):
+            term = term.lower()
+            queryset = queryset.filter(
+                Q(username_lower__range=(term, term + MAX_CHAR))
+                | Q(email_lower__range=(term, term + MAX_CHAR))
+            )
+        return queryset
+
+
+class TitleOrderingFilter(OrderingFilter):
+    def get_ordering(self, request, queryset, view):
+        if (
+            SEARCH_RANK in queryset.query.annotations
+            and not request.query_params.get(self.ordering_param)
+        ):
+            return (SEARCH_RANK, 'id')
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.tokens import RoleAccessToken
+from reviews.models import User
+
+
+class Command(BaseCommand):
+    help = 'Измеряет скорость выпуска и проверки токенов доступа.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=10000,
+            help='Сколько токенов выпускать и проверять.',
+        )
+
+    def measure(self, action, count):
+        start = time.perf_counter()
+        for _ in range(count):
+            action()
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        count = options['count']
+        # Пользователь не сохраняется: для токена нужны только поля.
+        user = User(id=1, username='benchmark', role='admin')
+        for token_class in (AccessToken, RoleAccessToken):
+            token = str(token_class.for_user(user))
+            issued = self.measure(
+                lambda: str(token_class.for_user(user)), count
+            )
+            verified = self.measure(lambda: token_class(token), count)
+            print(
+                f'{token_class.__name__}: выпуск {issued:.0f} токенов/с, '
+                f'проверка {verified:.0f} токенов/с'
+            )
@@ -0,0 +1,350 @@
+import json
+import operator
+from datetime import datetime
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.counts import cached_count
+from .serializers import FIELDS_PARAM
+
+
+def keyset_filter(ordering, position):
+    """Условие «строго после position» для сортировки ordering.
+
+    Раскрывает сравнение кортежей, направление каждого поля задаёт
+    минус в ordering. Нестрогое условие на первое поле позволяет
+    читать индекс диапазоном.
+    """
+    after = []
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        after.append(equal & Q(**{f'{name}__{lookup}': value}))
+        equal &= Q(**{name: value})
+    field = ordering[0]
+    lookup = 'lte' if field.startswith('-') else 'gte'
+    return Q(**{f'{field.lstrip("-")}__{lookup}': position[0]}) & reduce(
+        operator.or_, after
+    )
+
+
+def reverse_ordering(ordering):
+    return tuple(
+        field[1:] if field.startswith('-') else f'-{field}'
+        for field in ordering
+    )
+
+
+def keyset_value(value):
+    # DjangoJSONEncoder отбросил бы микросекунды даты.
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class OptionalCursorPagination(CursorPagination):
+    """Курсорная пагинация по запросу с параметром `cursor`.
+
+    Без параметра ответы строятся прежней пагинацией `fallback_class`,
+    первую страницу в курсорном режиме отдаёт запрос с `?cursor=`.
+    Курсор хранит значения всех полей сортировки последней строки,
+    и страница выбирается сравнением кортежей без OFFSET, поэтому
+    повторы первого поля не замедляют дальние страницы.
+    """
+    fallback_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.cursor_query_param not in request.query_params:
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        if not {'id', '-id', 'pk', '-pk'} & set(self.ordering):
+            self.ordering += ('id',)
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor.reverse
+        self.position = self.decode_position(cursor.position, queryset)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = reverse_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(keyset_filter(ordering, self.position))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        return self.page
+
+    def decode_position(self, position, queryset):
+        if position is None:
+            return None
+        try:
+            position = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        # Курсор приходит от клиента: значения приводятся к типам полей,
+        # чтобы подделанный курсор давал 404, а не ошибку в запросе.
+        try:
+            position = [
+                self.position_field(queryset, field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    @staticmethod
+    def position_field(queryset, field):
+        name = field.lstrip('-')
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        if name == 'pk':
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+
+    def encode_position(self, instance, reverse):
+        return self.encode_cursor(Cursor(
+            offset=0,
+            reverse=reverse,
+            position=json.dumps([
+                keyset_value(getattr(instance, field.lstrip('-')))
+                for field in self.ordering
+            ]),
+        ))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Пустая страница перед первой строкой: дальше - начало списка.
+            return replace_query_param(
+                self.base_url, self.cursor_query_param, ''
+            )
+        return self.encode_position(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_position(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.fallback_class().get_paginated_response_schema(schema)
+
+    def to_html(self):
+        if self.fallback is not None:
+            return self.fallback.to_html()
+        return super().to_html()
+
+
+class CountMixin:
+    """Считает строки списка без полного COUNT(*).
+
+    Число строк списка без фильтров берётся из `view.get_list_count()`,
+    если оно есть, иначе из кэша или статистики sqlite_stat1.
+    Отфильтрованные строки считаются точно, но не дальше count_cap после
+    текущей страницы. Если число оценено или упёрлось в порог, в ответе
+    есть `count_exact: false`.
+    """
+    count_cap = settings.PAGINATION_COUNT_CAP
+    # Параметры, которые не меняют состав списка.
+    list_params = (
+        FIELDS_PARAM, api_settings.ORDERING_PARAM,
+        api_settings.URL_FORMAT_OVERRIDE,
+    )
+
+    def prepare_count(self, request, view, page_end):
+        self.count_exact = True
+        self.count_view = view
+        self.max_count = None
+        if any(
+            value for param, value in request.query_params.items()
+            if param not in self.list_params
+        ):
+            self.max_count = page_end + self.count_cap
+
+    def count_rows(self, queryset):
+        if self.max_count is None:
+            get_list_count = getattr(self.count_view, 'get_list_count', None)
+            count, self.count_exact = (
+                cached_count(queryset) if get_list_count is None
+                else get_list_count()
+            )
+            return count
+        count = queryset[:self.max_count + 1].count()
+        if count <= self.max_count:
+            return count
+        self.count_exact = False
+        return self.max_count
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if not self.count_exact:
+            response.data['count_exact'] = False
+        return response
+
+
+class CountedLimitOffsetPagination(CountMixin, LimitOffsetPagination):
+    """Ссылка на следующую страницу ставится по лишней строке выборки.
+
+    Оценка числа строк может быть меньше настоящего, по ней
+    недоступными оказались бы последние страницы.
+    """
+    list_params = CountMixin.list_params + ('limit', 'offset')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        self.prepare_count(request, view, self.offset + self.limit)
+        self.count = self.count_rows(queryset)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        if self.count_exact and (
+            self.count == 0 or self.offset > self.count
+        ):
+            self.has_next = False
+            return []
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = replace_query_param(
+            self.request.build_absolute_uri(),
+            self.limit_query_param, self.limit
+        )
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+
+class CountedPage(Page):
+    # None - следующая страница определяется по числу строк.
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is None:
+            return super().has_next()
+        return self.has_more
+
+
+class CountedPaginator(Paginator):
+    """Не ограничивает номера страниц неточным числом строк.
+
+    Страница существует, если в ней есть строки, следующая - если
+    в выборке нашлась лишняя строка.
+    """
+
+    def __init__(self, object_list, per_page, pagination, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.pagination = pagination
+
+    @cached_property
+    def count(self):
+        return self.pagination.count_rows(self.object_list)
+
+    @property
+    def count_exact(self):
+        # Точность становится известна при подсчёте строк.
+        self.count
+        return self.pagination.count_exact
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return CountedPage(*args, **kwargs)
+
+
+class CountedPageNumberPagination(CountMixin, PageNumberPagination):
+    list_params = CountMixin.list_params + ('page',)
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(queryset, page_size, self)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        try:
+            page = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            page = 1
+        self.prepare_count(
+            request, view, max(page, 1) * (self.get_page_size(request) or 0)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+
+class TitlePagination(OptionalCursorPagination):
+    ordering = ('name', 'id')
+    fallback_class = CountedPageNumberPagination
+
+
+class ReviewPagination(OptionalCursorPagination):
+    ordering = ('-pub_date', 'id')
+    fallback_class = CountedPageNumberPagination
+
+
+class CommentsPagination(OptionalCursorPagination):
+    ordering = ('-pub_date', 'id')
+    fallback_class = LimitOffsetPagination
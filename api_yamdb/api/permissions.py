@@ -11,12 +11,19 @@ class IsAdminOrReadOnly(permissions.BasePermission):
 class IsAuthorORModeratorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return request.method in permissions.SAFE_METHODS or (
-            obj.author == request.user
+            obj.author_id == request.user.id
         ) or (
             request.user.is_authenticated and request.user.is_moderator
         )
 
 
+class IsModerator(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_moderator or request.user.is_admin
+        )
+
+
 class IsAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.is_admin
@@ -1,12 +1,20 @@
 from django.core.validators import MaxValueValidator
-from django.shortcuts import get_object_or_404
+from django.db import IntegrityError
+from django.db.models import Max
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 
+from api_yamdb.settings import (
+    SCORES_MAX_TITLES, TOP_TITLES_LIMIT, TOP_TITLES_MAX_LIMIT, USERS_BULK_MAX
+)
 from reviews.models import (
     Category, Comments, Genre, Review, Title, User,
     USERNAME_LENGTH, EMAIL_LENGTH, CONFIRMATION_CODE_LENGTH
 )
+from reviews.moderation import ACTIONS
 from reviews.validators import (
     UsernameValidation, get_now_year, YEAR_OVER_CURRENT
 )
@@ -15,6 +23,76 @@ MORE_THAN_ONE_REVIEW = (
     'Нельзя оставить больше одного отзыва '
     'на выбранное произведение.'
 )
+EMPTY_MODERATION_FILTER = (
+    'Укажите хотя бы один из параметров: '
+    'ids, author, title, since, until.'
+)
+TOO_MANY_USERS = 'Нельзя создать больше {limit} пользователей за раз.'
+FIELDS_PARAM = 'fields'
+SLUG_CACHE = 'slug_cache'
+UNIQUE_CACHE = 'unique_cache'
+
+
+def get_requested_fields(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = {
+        field.strip()
+        for field in request.query_params.get(FIELDS_PARAM, '').split(',')
+    } - {''}
+    return fields or None
+
+
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = get_requested_fields(self.context.get('request'))
+        if fields is None or not fields & set(self.fields):
+            return
+        for field in set(self.fields) - fields:
+            self.fields.pop(field)
+
+
+class CachedUniqueValidator(UniqueValidator):
+    """Сверяет значение с занятыми, загруженными для всего списка.
+
+    Прошедшее проверку значение тоже считается занятым,
+    так ловятся повторы внутри списка.
+    """
+
+    def __call__(self, value, serializer_field):
+        taken = serializer_field.context.get(UNIQUE_CACHE)
+        if taken is None:
+            return super().__call__(value, serializer_field)
+        taken = taken[serializer_field.source_attrs[-1]]
+        if value in taken:
+            raise ValidationError(self.message, code='unique')
+        taken.add(value)
+
+
+class UserListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            if len(data) > USERS_BULK_MAX:
+                raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                    TOO_MANY_USERS.format(limit=USERS_BULK_MAX)
+                ]})
+            items = [item for item in data if isinstance(item, dict)]
+            self.context[UNIQUE_CACHE] = {
+                field: set(User.objects.filter(**{f'{field}__in': {
+                    item.get(field) for item in items
+                    if isinstance(item.get(field), str)
+                }}).order_by().values_list(field, flat=True))
+                for field in ('username', 'email')
+            }
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        users = [User(**item) for item in validated_data]
+        # bulk_create не вызывает save().
+        for user in users:
+            user.fill_lower_fields()
+        return User.objects.bulk_create(users)
 
 
 class UserSerializer(serializers.ModelSerializer, UsernameValidation):
@@ -23,6 +101,17 @@ class UserSerializer(serializers.ModelSerializer, UsernameValidation):
         fields = (
             'username', 'first_name', 'last_name', 'email', 'role', 'bio'
         )
+        list_serializer_class = UserListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                CachedUniqueValidator(validator.queryset, validator.message)
+                if isinstance(validator, UniqueValidator) else validator
+                for validator in field.validators
+            ]
+        return fields
 
 
 class SignUpSerializer(serializers.Serializer, UsernameValidation):
@@ -49,7 +138,7 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
     rating = serializers.IntegerField(required=False)
@@ -58,15 +147,132 @@ class TitleSerializer(serializers.ModelSerializer):
         model = Title
         read_only_fields = ('__all__',)
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category',
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category',
+        )
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    def to_internal_value(self, data):
+        objects = self.context.get(SLUG_CACHE, {}).get(self.queryset.model)
+        if objects is None:
+            return super().to_internal_value(data)
+        try:
+            return objects[data]
+        except (KeyError, TypeError):
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=str(data)
+            )
+
+
+class TitleListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            items = [item for item in data if isinstance(item, dict)]
+            genres = {
+                slug for item in items
+                for slug in item.get('genre') or ()
+                if isinstance(slug, str)
+            }
+            categories = {
+                item.get('category') for item in items
+                if isinstance(item.get('category'), str)
+            }
+            self.context[SLUG_CACHE] = {
+                Genre: Genre.objects.in_bulk(genres, field_name='slug'),
+                Category: Category.objects.in_bulk(
+                    categories, field_name='slug'
+                ),
+            }
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        genres = [item.pop('genre') for item in validated_data]
+        titles = Title.objects.bulk_create(
+            Title(**item) for item in validated_data
+        )
+        if titles and titles[0].pk is None:
+            # SQLite не возвращает id из bulk_create. Внутри транзакции
+            # другой записи в таблицу быть не может, и вставленные
+            # строки получают подряд идущие id.
+            last_id = Title.objects.aggregate(
+                last_id=Max('id')
+            )['last_id']
+            for title_id, title in zip(
+                range(last_id - len(titles) + 1, last_id + 1), titles
+            ):
+                title.pk = title_id
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.id, genre_id=genre.id)
+            for title, title_genres in zip(titles, genres)
+            for genre in title_genres
         )
+        return titles
+
+
+class TopTitleSerializer(TitleSerializer):
+    weighted_rating = serializers.FloatField(read_only=True)
+
+    class Meta(TitleSerializer.Meta):
+        fields = TitleSerializer.Meta.fields + ('weighted_rating',)
+
+
+class TopTitleQuerySerializer(serializers.Serializer):
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=TOP_TITLES_MAX_LIMIT,
+        default=TOP_TITLES_LIMIT,
+    )
+
+
+class TitleScoresSerializer(serializers.ModelSerializer):
+    scores = serializers.DictField(
+        source='score_histogram',
+        child=serializers.IntegerField(),
+        read_only=True,
+    )
+
+    class Meta:
+        model = Title
+        fields = ('id', 'scores')
+
+
+class TitleScoresQuerySerializer(serializers.Serializer):
+    id = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=SCORES_MAX_TITLES,
+    )
+
+
+class ModerationSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=ACTIONS)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+    )
+    author = serializers.CharField(
+        max_length=USERNAME_LENGTH,
+        required=False,
+    )
+    title = serializers.IntegerField(min_value=1, required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if set(data) == {'action'}:
+            raise ValidationError(EMPTY_MODERATION_FILTER)
+        return data
 
 
 class TitlePostEditSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = CachedSlugRelatedField(
         many=True, slug_field='slug', queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = CachedSlugRelatedField(
         slug_field='slug', queryset=Category.objects.all()
     )
     year = serializers.IntegerField(validators=(MaxValueValidator(
@@ -76,9 +282,10 @@ class TitlePostEditSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        list_serializer_class = TitleListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
@@ -86,22 +293,21 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = ('id', 'text', 'author', 'score', 'pub_date', 'comment_count')
+        read_only_fields = ('comment_count',)
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method != 'POST':
-            return data
-        title = get_object_or_404(
-            Title,
-            id=self.context['view'].kwargs.get('title_id')
-        )
-        if Review.objects.filter(title=title, author=request.user):
-            raise ValidationError(MORE_THAN_ONE_REVIEW)
-        return data
+    def create(self, validated_data):
+        # Повторный отзыв отсекает ограничение reviews_per_title,
+        # без отдельного запроса на проверку.
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [MORE_THAN_ONE_REVIEW]}
+            )
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
         slug_field='username',
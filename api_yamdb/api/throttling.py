@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from reviews.models import EMAIL_LENGTH
+
+BUCKET_KEY = 'throttle:{scope}:{ident}'
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+class LocalBucketStore:
+    """Корзины токенов в памяти процесса.
+
+    Хранит не больше size корзин, дольше всех не использованные
+    вытесняются: полная корзина ничем не отличается от новой.
+    """
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def take(self, key, capacity, duration, now):
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens, wait = refill(tokens, updated, capacity, duration, now)
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > self.size:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBucketStore:
+    """Корзины токенов в кэше Django, общие для процессов.
+
+    Чтение и запись не атомарны: при гонке запрос может пройти сверх
+    бюджета, чего достаточно для защиты от потока запросов.
+    """
+    clock = staticmethod(time.time)
+
+    def take(self, key, capacity, duration, now):
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens, wait = refill(tokens, updated, capacity, duration, now)
+        cache.set(key, (tokens, now), duration)
+        return wait
+
+
+def refill(tokens, updated, capacity, duration, now):
+    """Пополняет корзину за прошедшее время и забирает один токен.
+
+    Возвращает остаток и сколько секунд ждать, если токенов нет.
+    """
+    rate = capacity / duration
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / rate
+
+
+local_store = LocalBucketStore(settings.THROTTLE_LOCAL_BUCKETS)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничивает запросы корзиной токенов на каждый ключ из get_idents.
+
+    Ёмкость и время полного пополнения берутся из DEFAULT_THROTTLE_RATES
+    по scope в формате DRF, например '5/min'.
+    """
+    scope = None
+
+    def __init__(self):
+        requests, period = api_settings.DEFAULT_THROTTLE_RATES[
+            self.scope
+        ].split('/')
+        self.capacity = int(requests)
+        self.duration = DURATIONS[period[0]]
+        self.store = (
+            CacheBucketStore() if settings.THROTTLE_SHARED else local_store
+        )
+        self.wait_time = None
+
+    def get_idents(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        now = self.store.clock()
+        waits = [
+            self.store.take(
+                BUCKET_KEY.format(scope=self.scope, ident=ident),
+                self.capacity, self.duration, now
+            )
+            for ident in self.get_idents(request)
+        ]
+        self.wait_time = max(waits, default=0)
+        return not self.wait_time
+
+    def wait(self):
+        return self.wait_time
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    scope = 'auth_ip'
+
+    def get_idents(self, request):
+        return [self.get_ident(request)]
+
+
+class AuthIdentityThrottle(TokenBucketThrottle):
+    """Отдельные бюджеты на username и email из тела запроса."""
+    scope = 'auth_identity'
+    fields = ('username', 'email')
+
+    def get_idents(self, request):
+        if not isinstance(request.data, Mapping):
+            return []
+        return [
+            f'{field}:{str(request.data[field])[:EMAIL_LENGTH].lower()}'
+            for field in self.fields
+            if request.data.get(field)
+        ]
@@ -0,0 +1,114 @@
+import json
+import time
+from functools import lru_cache
+
+import jwt
+from django.conf import settings
+from django.utils.encoding import force_str
+from django.utils.translation import gettext_lazy as _
+from jwt import InvalidAlgorithmError, InvalidTokenError
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_decode
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+KID_HEADER = 'kid'
+ISSUED_CLAIM = 'iat'
+ROLE_CLAIM = 'role'
+STAFF_CLAIM = 'is_staff'
+
+
+class KeyRotationTokenBackend(TokenBackend):
+    """Подписывает токены ключом signing_kid и ставит его kid в заголовок.
+
+    Токены проверяются ключом из своего заголовка, поэтому после смены
+    signing_kid выданные раньше токены действуют, пока их ключ в keys.
+    Токены без kid проверяются ключом legacy_key, а без него
+    отклоняются. Ключи готовятся алгоритмом один раз при создании.
+    """
+
+    def __init__(self, algorithm, keys, signing_kid, legacy_key=None,
+                 audience=None, issuer=None):
+        super().__init__(
+            algorithm, keys[signing_kid], audience=audience, issuer=issuer
+        )
+        prepare_key = get_default_algorithms()[algorithm].prepare_key
+        self.keys = {kid: prepare_key(key) for kid, key in keys.items()}
+        self.legacy_key = (
+            None if legacy_key is None else prepare_key(legacy_key)
+        )
+        self.signing_kid = signing_kid
+        self.signing_key = self.verifying_key = self.keys[signing_kid]
+        self.headers = {KID_HEADER: signing_kid}
+        # У всех токенов одного ключа одинаковый заголовок.
+        self.get_header_key = lru_cache(maxsize=32)(self.get_header_key)
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+        return jwt.encode(
+            jwt_payload, self.signing_key,
+            algorithm=self.algorithm, headers=self.headers,
+        )
+
+    def get_header_key(self, header):
+        try:
+            kid = json.loads(base64url_decode(header)).get(KID_HEADER)
+        except (ValueError, TypeError, AttributeError):
+            raise TokenBackendError(_('Token is invalid or expired'))
+        if kid is None and self.legacy_key is not None:
+            return self.legacy_key
+        if kid not in self.keys:
+            raise TokenBackendError(_('Token is invalid or expired'))
+        return self.keys[kid]
+
+    def get_verifying_key(self, token):
+        return self.get_header_key(force_str(token).split('.', 1)[0])
+
+    def decode(self, token, verify=True):
+        try:
+            return jwt.decode(
+                token, self.get_verifying_key(token),
+                algorithms=[self.algorithm],
+                audience=self.audience, issuer=self.issuer,
+                options={
+                    'verify_aud': self.audience is not None,
+                    'verify_signature': verify,
+                },
+            )
+        except InvalidAlgorithmError as ex:
+            raise TokenBackendError(_('Invalid algorithm specified')) from ex
+        except InvalidTokenError:
+            raise TokenBackendError(_('Token is invalid or expired'))
+
+
+token_backend = KeyRotationTokenBackend(
+    api_settings.ALGORITHM,
+    settings.JWT_SIGNING_KEYS,
+    settings.JWT_SIGNING_KID,
+    settings.JWT_LEGACY_SIGNING_KEY,
+    api_settings.AUDIENCE,
+    api_settings.ISSUER,
+)
+
+
+class RoleAccessToken(AccessToken):
+    """Токен доступа с ролью пользователя в утверждениях."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[STAFF_CLAIM] = user.is_staff
+        # С долями секунды: токен, выпущенный сразу после отзыва,
+        # не попадает под него.
+        token[ISSUED_CLAIM] = time.time()
+        return token
+
+    def get_token_backend(self):
+        return token_backend
@@ -8,6 +8,8 @@ from api.views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    export,
+    moderate,
     signup,
     get_token
 )
@@ -34,6 +36,8 @@ auth_patterns = [
 ]
 
 urlpatterns = [
+    path('v1/export/<slug:kind>/', export),
+    path('v1/moderation/<slug:kind>/', moderate),
     path('v1/', include(router_v1.urls)),
     path('v1/', include(auth_patterns)),
 ]
@@ -1,45 +1,137 @@
-from django.core.mail import send_mail
-from django.db import IntegrityError
-from django.db.models import Avg
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Subquery
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.crypto import get_random_string
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import AllowAny, SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework import filters, mixins, permissions, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.pagination import (
-    LimitOffsetPagination,
-    PageNumberPagination,
+from rest_framework.decorators import (
+    action, api_view, permission_classes, throttle_classes
 )
-from rest_framework_simplejwt.settings import api_settings
+from rest_framework.exceptions import ValidationError
 
+from api_yamdb.settings import EXPORT_CHUNK_SIZE
 from reviews.models import (
-    Category, Genre, Review, Title, User, CONFIRMATION_CODE_LENGTH
+    Category, Comments, Genre, Review, Title, TopTitle, User,
+    CONFIRMATION_CODE_LENGTH, SCORE_FIELDS
+)
+from reviews.moderation import moderate_comments, moderate_reviews
+from reviews.outbox import enqueue_email
+from reviews.search import index_titles, unindex_title
+from reviews.versions import bump_version
+from .authentication import load_user
+from .caching import (
+    ConditionalGetMixin, VersionedCacheMixin, VersionedCacheRetrieveMixin
+)
+from .filtres import (
+    TitleFilter, TitleOrderingFilter, TitleSearchFilter, UserSearchFilter
+)
+from .pagination import (
+    CommentsPagination, CountedLimitOffsetPagination, ReviewPagination,
+    TitlePagination
 )
-from .filtres import TitleFilter
 from .permissions import (
-    IsAdmin, IsAuthorORModeratorOrReadOnly, IsAdminOrReadOnly
+    IsAdmin, IsAuthorORModeratorOrReadOnly, IsAdminOrReadOnly, IsModerator
 )
 from .serializers import (
     CategorySerializer,
     CommentsSerializer,
     GenreSerializer,
+    ModerationSerializer,
     ReviewSerializer,
     SignUpSerializer,
     TitleSerializer,
     TitlePostEditSerializer,
+    TitleScoresQuerySerializer,
+    TitleScoresSerializer,
+    TopTitleQuerySerializer,
+    TopTitleSerializer,
     TokenSerializer,
     UserSerializer,
+    get_requested_fields,
 )
+from .throttling import AuthIdentityThrottle, AuthIPThrottle
+from .tokens import RoleAccessToken
 
 USERNAME_EMAIL_ALREADY_EXISTS = 'Такое username или email уже занято.'
 CORRECT_CODE_EMAIL_MESSAGE = 'Код подтверждения: {code}.'
 INVALID_CODE = 'Неверный код подтверждения.'
+INVALID_SINCE = 'Укажите дату и время в формате ISO 8601.'
+SINCE_PARAM = 'since'
+# Модель выгрузки, условия на её родительские записи и столбцы:
+# имя поля в строке NDJSON и столбец в базе.
+EXPORTS = {
+    'reviews': (Review, {'title__is_deleted': False}, {
+        'id': 'id',
+        'title': 'title_id',
+        'author': 'author__username',
+        'text': 'text',
+        'score': 'score',
+        'pub_date': 'pub_date',
+        'comment_count': 'comment_count',
+    }),
+    'comments': (Comments, {
+        'review__title__is_deleted': False,
+        'review__is_hidden': False,
+        'review__author__is_deleted': False,
+    }, {
+        'id': 'id',
+        'title': 'review__title_id',
+        'review': 'review_id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }),
+}
+# Поля сериализаторов и столбцы, которые нужны для их вывода.
+TITLE_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'year': 'year',
+    'rating': 'rating',
+    'review_count': 'review_count',
+    'description': 'description',
+    'category': 'category',
+    'genre': 'id',
+}
+REVIEW_COLUMNS = {
+    'id': 'id',
+    'text': 'text',
+    'author': 'author__username',
+    'score': 'score',
+    'pub_date': 'pub_date',
+    'comment_count': 'comment_count',
+}
+COMMENTS_COLUMNS = {
+    'id': 'id',
+    'text': 'text',
+    'author': 'author__username',
+    'pub_date': 'pub_date',
+}
+
+
+def only_requested(queryset, request, columns, required):
+    if request.method not in SAFE_METHODS:
+        return queryset
+    fields = get_requested_fields(request)
+    if fields is None or not fields & set(columns):
+        fields = set(columns)
+    columns = [
+        column for field, column in columns.items() if field in fields
+    ]
+    # Поля связанных моделей приходят тем же запросом через JOIN.
+    related = {column.split('__')[0] for column in columns if '__' in column}
+    return queryset.select_related(*related).only(*required, *columns)
 
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((AuthIPThrottle, AuthIdentityThrottle))
 def signup(request):
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -47,6 +139,7 @@ def signup(request):
         user, _ = User.objects.get_or_create(
             email=serializer.validated_data.get('email'),
             username=serializer.validated_data.get('username'),
+            is_deleted=False,
         )
     except IntegrityError:
         return Response(
@@ -54,48 +147,128 @@ def signup(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     user.confirmation_code = get_random_string(length=CONFIRMATION_CODE_LENGTH)
-    user.save()
-    send_mail(
+    user.save(update_fields=('confirmation_code',))
+    enqueue_email(
         subject='Код регистрации на сервисе YaMDb',
         message=CORRECT_CODE_EMAIL_MESSAGE.format(
             code=user.confirmation_code
         ),
+        recipient=user.email,
         from_email='webmaster@localhost',
-        recipient_list=[user.email, ],
     )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes((AllowAny,))
+@throttle_classes((AuthIPThrottle, AuthIdentityThrottle))
 def get_token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     user = get_object_or_404(
         User,
-        username=serializer.validated_data.get('username')
+        username=serializer.validated_data.get('username'),
+        is_deleted=False,
+        is_active=True,
     )
     if (user.confirmation_code == serializer.validated_data.get(
             'confirmation_code'
     )) and user.confirmation_code:
-        jwt_payload_handler = api_settings.JWT_PAYLOAD_HANDLER
-        jwt_encode_handler = api_settings.JWT_ENCODEHANDLER
-        payload = jwt_payload_handler(request.user)
-        token = jwt_encode_handler(payload)
-        return Response({'token': token}, status=status.HTTP_200_OK)
+        return Response(
+            {'token': str(RoleAccessToken.for_user(user))},
+            status=status.HTTP_200_OK
+        )
     user.confirmation_code = ''
-    user.save()
+    user.save(update_fields=('confirmation_code',))
     return Response(INVALID_CODE, status=status.HTTP_400_BAD_REQUEST)
 
 
+def ndjson_lines(queryset, names):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes((IsAdmin,))
+def export(request, kind):
+    if kind not in EXPORTS:
+        raise Http404
+    model, filters, columns = EXPORTS[kind]
+    queryset = model.objects.filter(
+        is_hidden=False, author__is_deleted=False, **filters
+    ).order_by('pub_date', 'id')
+    since = request.query_params.get(SINCE_PARAM)
+    if since is not None:
+        try:
+            since = parse_datetime(since)
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError({SINCE_PARAM: [INVALID_SINCE]})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        queryset = queryset.filter(pub_date__gte=since)
+    # Строки читаются курсором частями и сразу уходят клиенту,
+    # поэтому память не растёт с размером выгрузки.
+    return StreamingHttpResponse(
+        ndjson_lines(
+            queryset.values_list(*columns.values()), tuple(columns)
+        ),
+        content_type='application/x-ndjson',
+    )
+
+
+# Модель, обработчик и поле произведения для массовой модерации.
+MODERATION = {
+    'reviews': (Review, moderate_reviews, 'title_id'),
+    'comments': (Comments, moderate_comments, 'review__title_id'),
+}
+
+
+@api_view(['POST'])
+@permission_classes((IsModerator,))
+def moderate(request, kind):
+    if kind not in MODERATION:
+        raise Http404
+    model, handler, title_field = MODERATION[kind]
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    queryset = model.objects.filter(is_hidden=False)
+    if 'ids' in data:
+        queryset = queryset.filter(id__in=data['ids'])
+    if 'author' in data:
+        queryset = queryset.filter(author__username=data['author'])
+    if 'title' in data:
+        queryset = queryset.filter(**{title_field: data['title']})
+    if 'since' in data:
+        queryset = queryset.filter(pub_date__gte=data['since'])
+    if 'until' in data:
+        queryset = queryset.filter(pub_date__lt=data['until'])
+    return Response(
+        {'count': handler(queryset, data['action'])},
+        status=status.HTTP_200_OK,
+    )
+
+
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.filter(is_deleted=False)
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
-    filter_backends = (filters.SearchFilter,)
-    search_fields = ('username',)
+    filter_backends = (UserSearchFilter,)
     lookup_field = 'username'
-    pagination_class = LimitOffsetPagination
+    pagination_class = CountedLimitOffsetPagination
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+            transaction.on_commit(lambda: bump_version(User))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(
         methods=['get', 'patch'],
@@ -104,19 +277,34 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(permissions.IsAuthenticated,)
     )
     def user_profile(self, request):
+        # Роль в утверждениях токена могла устареть, профиль
+        # строится по записи пользователя.
+        user = load_user(request.user.id)
         if request.method != 'PATCH':
-            return Response(self.get_serializer(request.user).data)
+            return Response(self.get_serializer(user).data)
         serializer = self.get_serializer(
-            request.user,
+            user,
             data=request.data,
             partial=True,
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role)
+        serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        if not (
+            Review.objects.filter(author_id=instance.id).exists()
+            or Comments.objects.filter(author_id=instance.id).exists()
+        ):
+            return super().perform_destroy(instance)
+        User.soft_delete(instance.id)
+        for model in (User, Title, Review):
+            transaction.on_commit(lambda model=model: bump_version(model))
+
 
 class CategoryGenreViewSet(
+    VersionedCacheMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
@@ -131,69 +319,246 @@ class CategoryGenreViewSet(
 class CategoryViewSet(CategoryGenreViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
 
 class GenreViewSet(CategoryGenreViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    )
-    pagination_class = PageNumberPagination
+class TitleViewSet(
+    ConditionalGetMixin,
+    VersionedCacheRetrieveMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Title.objects.filter(is_deleted=False).select_related(
+        'category'
+    ).prefetch_related('genre').defer(*SCORE_FIELDS)
+    pagination_class = TitlePagination
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter
+        TitleSearchFilter,
+        TitleOrderingFilter,
     )
     filterset_class = TitleFilter
     ordering_fields = ['name', ]
+    ordering = ('name', 'id')
+    cache_models = (Title, Genre, Category, Review)
+    validator_models = cache_models
+
+    def get_queryset(self):
+        if self.action in ('scores', 'titles_scores'):
+            return Title.objects.filter(is_deleted=False).only(
+                'id', *SCORE_FIELDS
+            )
+        queryset = super().get_queryset()
+        fields = get_requested_fields(self.request)
+        if fields is None or not fields & set(TITLE_COLUMNS):
+            return queryset
+        if 'category' not in fields:
+            queryset = queryset.select_related(None)
+        if 'genre' not in fields:
+            queryset = queryset.prefetch_related(None)
+        return only_requested(
+            queryset, self.request, TITLE_COLUMNS, ('id', 'name')
+        )
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
             return TitleSerializer
         return TitlePostEditSerializer
 
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            titles = serializer.save()
+            index_titles(titles)
+            TopTitle.sync([title.id for title in titles])
+            transaction.on_commit(lambda: bump_version(Title))
+        serializer = self.get_serializer(
+            Title.objects.filter(
+                id__in=[title.id for title in titles]
+            ).order_by('id').select_related('category').prefetch_related(
+                'genre'
+            ),
+            many=True,
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        if not Review.objects.filter(title_id=instance.id).exists():
+            return super().perform_destroy(instance)
+        # Сборщик Django загрузил бы все отзывы и комментарии
+        # произведения, их удаляет команда purge_deleted.
+        Title.soft_delete(instance.id)
+        unindex_title(instance.id)
+        # Отзывы и комментарии произведения становятся недоступны,
+        # их ETag больше не должны подтверждаться.
+        for model in (Title, Review, Comments):
+            transaction.on_commit(lambda model=model: bump_version(model))
+
+    @action(methods=['get'], detail=False, url_path='top')
+    def top(self, request):
+        query = TopTitleQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        # Слаги сравниваются в подзапросах, чтобы условия на genre_id
+        # и category_id шли по индексам TopTitle без сортировки.
+        if 'genre' in query.validated_data:
+            top = TopTitle.objects.filter(genre_id=Subquery(
+                Genre.objects.filter(
+                    slug=query.validated_data['genre']
+                ).values('id')
+            ))
+        else:
+            top = TopTitle.objects.filter(genre_id__isnull=True)
+        if 'category' in query.validated_data:
+            top = top.filter(category_id=Subquery(
+                Category.objects.filter(
+                    slug=query.validated_data['category']
+                ).values('id')
+            ))
+        titles = []
+        for entry in top.select_related(
+            'title', 'title__category'
+        ).prefetch_related('title__genre').order_by(
+            '-score', 'title_id'
+        )[:query.validated_data['limit']]:
+            entry.title.weighted_rating = entry.score
+            titles.append(entry.title)
+        return Response(TopTitleSerializer(
+            titles, many=True, context=self.get_serializer_context()
+        ).data)
+
+    @action(methods=['get'], detail=True, url_path='scores')
+    def scores(self, request, pk=None):
+        return self.conditional_response(
+            lambda request: Response(
+                TitleScoresSerializer(self.get_object()).data
+            ),
+            request,
+        )
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    @action(methods=['get'], detail=False, url_path='scores')
+    def titles_scores(self, request):
+        query = TitleScoresQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        # Гистограммы хранятся в строках произведений,
+        # поэтому любая страница произведений читается одним запросом.
+        return self.conditional_response(
+            lambda request: Response(TitleScoresSerializer(
+                self.get_queryset().filter(
+                    id__in=query.validated_data['id']
+                ).order_by('id'),
+                many=True,
+            ).data),
+            request,
+        )
+
+
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsAuthorORModeratorOrReadOnly,
     )
+    pagination_class = ReviewPagination
+    validator_models = (Title, Review, Comments, User)
 
     def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+        if not hasattr(self, 'title'):
+            self.title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id'), is_deleted=False
+            )
+        return self.title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return only_requested(
+            self.get_title().reviews.filter(
+                is_hidden=False, author__is_deleted=False
+            ),
+            self.request, REVIEW_COLUMNS, ('id', 'pub_date', 'title')
+        )
+
+    def get_list_count(self):
+        # Счётчик учитывает те же отзывы, что и get_queryset:
+        # не скрытые и не от удалённых авторов.
+        return self.get_title().review_count, True
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(
+        review = serializer.save(
             title=self.get_title(),
             author=self.request.user
         )
+        Title.apply_score(
+            review.title_id, new_score=review.score, review_delta=1
+        )
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        review = serializer.save()
+        Title.apply_score(review.title_id, old_score, review.score)
 
-class CommentsViewSet(viewsets.ModelViewSet):
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        Title.apply_score(
+            instance.title_id, old_score=instance.score, review_delta=-1
+        )
+
+
+class CommentsViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = CommentsSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsAuthorORModeratorOrReadOnly,
     )
-    pagination_class = LimitOffsetPagination
+    pagination_class = CommentsPagination
+    validator_models = (Title, Review, Comments, User)
 
     def get_review(self):
-        return get_object_or_404(Review, id=self.kwargs.get('review_id'))
+        if not hasattr(self, 'review'):
+            self.review = get_object_or_404(
+                Review.objects.only('id', 'title_id'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+                title__is_deleted=False,
+                is_hidden=False,
+                author__is_deleted=False,
+            )
+        return self.review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return only_requested(
+            Comments.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id'),
+                review__title__is_deleted=False,
+                review__is_hidden=False,
+                review__author__is_deleted=False,
+                is_hidden=False,
+                author__is_deleted=False,
+            ),
+            self.request, COMMENTS_COLUMNS, ('id', 'pub_date', 'review')
+        )
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(
+        comment = serializer.save(
             author=self.request.user,
             review=self.get_review()
         )
+        Review.apply_comments(comment.review_id, 1)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        Review.apply_comments(instance.review_id, -1)
@@ -111,6 +111,29 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 
 TEXT_SCOPE = 15
 
+# Взвешенный рейтинг лучших произведений: оценки тянутся
+# к TOP_TITLES_PRIOR_SCORE, пока отзывов меньше TOP_TITLES_MIN_VOTES.
+TOP_TITLES_MIN_VOTES = 5
+TOP_TITLES_PRIOR_SCORE = 5.5
+TOP_TITLES_LIMIT = 10
+TOP_TITLES_MAX_LIMIT = 100
+# Сколько произведений можно запросить в /titles/scores/ за раз.
+SCORES_MAX_TITLES = 100
+
+# Сколько пользователей можно создать одним POST на /users/.
+USERS_BULK_MAX = 5000
+
+# Сколько строк выгрузки читается из базы за один запрос курсора.
+EXPORT_CHUNK_SIZE = 2000
+
+# Сколько строк команда purge_deleted удаляет в одной транзакции.
+PURGE_BATCH_SIZE = 500
+
+# Отфильтрованные списки считаются не дальше PAGINATION_COUNT_CAP строк
+# после текущей страницы. Списки без фильтров длиннее порога по данным
+# ANALYZE получают оценку числа строк из sqlite_stat1.
+PAGINATION_COUNT_CAP = 1000
+
 AUTH_USER_MODEL = 'reviews.User'
 
 REST_FRAMEWORK = {
@@ -118,16 +141,76 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '20/min',
+        'auth_identity': '5/min',
+    },
+    # Число прокси перед приложением: при 0 ограничения по IP берут
+    # REMOTE_ADDR, а не X-Forwarded-For, который подставляет клиент.
+    'NUM_PROXIES': 0,
 }
 
+# Корзины токенов для регистрации и выдачи токена живут в памяти
+# процесса; с THROTTLE_SHARED они хранятся в кэше Django.
+THROTTLE_SHARED = False
+THROTTLE_LOCAL_BUCKETS = 10000
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'AUTH_TOKEN_CLASSES': ('api.tokens.RoleAccessToken',),
 }
 
+# Ключи подписи токенов по kid. Новые токены подписываются ключом
+# JWT_SIGNING_KID; чтобы сменить ключ, добавьте новый и переключите
+# JWT_SIGNING_KID, а старый удалите, когда истекут выданные им токены.
+JWT_SIGNING_KEYS = {
+    'primary': SECRET_KEY,
+}
+JWT_SIGNING_KID = 'primary'
+# Ключ токенов без kid, выпущенных до ротации ключей. None отключает
+# их приём, когда выданные такие токены истекут.
+JWT_LEGACY_SIGNING_KEY = SECRET_KEY
+
+# Версии моделей хранятся в кэше default, ответы API и число строк -
+# в отдельном кэше responses, чтобы поток анонимных запросов не вытеснял
+# версии. Для нескольких процессов на одной машине подойдёт
+# FileBasedCache с общим LOCATION.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+RESPONSE_CACHE = 'responses'
+
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+# Сколько пользователей держит в памяти процесса кэш для аутентификации.
+USER_CACHE_SIZE = 1024
+
+# Отметки отзыва токенов хранятся в базе. Процесс перечитывает их, когда
+# меняется их версия, и не реже чем раз в столько секунд: изменение версии
+# в кэше другого процесса может быть не видно.
+TOKEN_REVOCATION_REFRESH = 5
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Письма пишутся в очередь и отправляются командой send_emails.
+# С EMAIL_OUTBOX_EAGER письмо отправляется сразу после коммита запроса.
+EMAIL_OUTBOX_EAGER = False
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повтором в секундах, удваивается с каждой попыткой.
+EMAIL_OUTBOX_RETRY_DELAY = 60
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Category, Comments, Genre, Review, Title, User
+from .models import (
+    Category, Comments, Genre, OutboxEmail, Review, Title, TopTitle, User
+)
 
 
 @admin.register(Category)
@@ -14,7 +16,7 @@ class CategoryAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('review',)
     search_fields = ('review', 'name',)
-    list_filter = ('review',)
+    list_filter = ('review', 'is_hidden',)
     empty_value_display = '-пусто-'
 
 
@@ -25,11 +27,21 @@ class GenreAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'recipient', 'subject', 'created', 'attempts', 'sent',
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent', 'attempts',)
+    empty_value_display = '-пусто-'
+
+
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ('id', 'title', 'author', 'pub_date', 'score',)
     search_fields = ('title', 'author', 'pub_date', 'score',)
-    list_filter = ('title', 'author', 'pub_date', 'score',)
+    list_filter = ('title', 'author', 'pub_date', 'score', 'is_hidden',)
     empty_value_display = '-пусто-'
 
 
@@ -41,6 +53,13 @@ class TitleAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+@admin.register(TopTitle)
+class TopTitleAdmin(admin.ModelAdmin):
+    list_display = ('title', 'genre', 'category', 'score',)
+    list_filter = ('genre', 'category',)
+    empty_value_display = '-пусто-'
+
+
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = (
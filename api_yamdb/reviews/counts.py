@@ -0,0 +1,58 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import OperationalError, connection
+
+from reviews.versions import get_versions
+
+COUNT_KEY = 'count:{query}:{version}'
+ESTIMATE_KEY = 'estimate:{table}'
+
+
+def table_estimate(model):
+    """Число строк таблицы по статистике ANALYZE, 0 - если её нет.
+
+    Статистика меняется только при ANALYZE и хранится в кэше.
+    """
+    cache = caches[settings.RESPONSE_CACHE]
+    key = ESTIMATE_KEY.format(table=model._meta.db_table)
+    estimate = cache.get(key)
+    if estimate is not None:
+        return estimate
+    with connection.cursor() as cursor:
+        try:
+            # Первое число в stat - строки таблицы на момент ANALYZE.
+            cursor.execute(
+                'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                [model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        except OperationalError:
+            # ANALYZE не запускался, таблицы статистики нет.
+            row = None
+    estimate = int(row[0].split()[0]) if row else 0
+    cache.set(key, estimate, settings.RESPONSE_CACHE_TIMEOUT)
+    return estimate
+
+
+def cached_count(queryset):
+    """Число строк запроса и признак точности.
+
+    Результат хранится в кэше до изменения модели. Если по статистике
+    строк больше PAGINATION_COUNT_CAP, вместо COUNT(*) берётся оценка.
+    """
+    cache = caches[settings.RESPONSE_CACHE]
+    key = COUNT_KEY.format(
+        query=hashlib.md5(str(queryset.query).encode()).hexdigest(),
+        version=get_versions(queryset.model)[0],
+    )
+    result = cache.get(key)
+    if result is None:
+        estimate = table_estimate(queryset.model)
+        if estimate > settings.PAGINATION_COUNT_CAP:
+            result = (estimate, False)
+        else:
+            result = (queryset.count(), True)
+        cache.set(key, result, settings.RESPONSE_CACHE_TIMEOUT)
+    return result
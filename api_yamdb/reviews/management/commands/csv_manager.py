@@ -5,6 +5,12 @@ import sqlite3
 from django.conf import settings
 from django.core.management import BaseCommand
 
+from reviews.models import (
+    Category, Genre, Review, Title, TopTitle, SCORE_FIELDS
+)
+from reviews.search import rebuild_title_index
+from reviews.versions import bump_version
+
 
 class Command(BaseCommand):
     def handle(self, *args, **options):
@@ -24,14 +30,18 @@ class Command(BaseCommand):
                 i['role'],
                 i['bio'],
                 i['first_name'],
-                i['last_name']) for i in dr]
+                i['last_name'],
+                i['username'].lower(),
+                i['email'].lower()) for i in dr]
         cur.executemany("INSERT INTO reviews_user"
                         "(id, username, email, role,"
-                        "bio, first_name, last_name, is_superuser,"
+                        "bio, first_name, last_name, username_lower,"
+                        "email_lower, is_superuser,"
                         "is_staff, is_active, date_joined, password, "
-                        "confirmation_code, last_login)"
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, false,"
-                        "false, false, false, false, false, false);", to_db)
+                        "confirmation_code, last_login, is_deleted)"
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, false,"
+                        "false, false, false, false, false, false,"
+                        "false);", to_db)
         con.commit()
         print("Запись успешно вставлена в таблицу reviews_user ", cur.rowcount)
 
@@ -84,8 +94,10 @@ class Command(BaseCommand):
                  i['year'],
                  i['category']) for i in dr]
         cur.executemany("INSERT INTO reviews_title"
-                        "(id, name, year, category_id)"
-                        "VALUES (?, ?, ?, ?);", to_db)
+                        "(id, name, year, category_id, score_sum, score_count,"
+                        f"review_count, is_deleted, {', '.join(SCORE_FIELDS)})"
+                        "VALUES (?, ?, ?, ?, 0, 0, 0, false"
+                        f"{', 0' * len(SCORE_FIELDS)});", to_db)
         con.commit()
         print(
             "Запись успешно вставлена в таблицу reviews_title ", cur.rowcount
@@ -105,8 +117,9 @@ class Command(BaseCommand):
                  i['score'],
                  i['pub_date']) for i in dr]
         cur.executemany("INSERT INTO reviews_review"
-                        "(id, title_id, text, author_id, score, pub_date)"
-                        "VALUES (?, ?, ?, ?, ?, ?);", to_db)
+                        "(id, title_id, text, author_id, score, pub_date,"
+                        "comment_count, is_hidden)"
+                        "VALUES (?, ?, ?, ?, ?, ?, 0, false);", to_db)
         con.commit()
         print(
             "Запись успешно вставлена в таблицу reviews_review ", cur.rowcount
@@ -125,8 +138,9 @@ class Command(BaseCommand):
                  i['author'],
                  i['pub_date']) for i in dr]
         cur.executemany("INSERT INTO reviews_comments"
-                        "(id, review_id, text, author_id, pub_date)"
-                        "VALUES (?, ?, ?, ?, ?);", to_db)
+                        "(id, review_id, text, author_id, pub_date,"
+                        "is_hidden)"
+                        "VALUES (?, ?, ?, ?, ?, false);", to_db)
         con.commit()
         print(
             "Запись успешно вставлена в таблицу reviews_comment ", cur.rowcount
@@ -152,3 +166,14 @@ class Command(BaseCommand):
         )
 
         con.close()
+        print(
+            "Пересчитаны рейтинги произведений ", Title.rebuild_ratings()
+        )
+        TopTitle.sync()
+        Title.rebuild_review_counts()
+        Review.rebuild_comment_counts()
+        print("Пересчитаны счётчики отзывов и комментариев")
+        rebuild_title_index()
+        print("Перестроен поисковый индекс произведений")
+        for model in (Category, Genre, Title, Review):
+            bump_version(model)
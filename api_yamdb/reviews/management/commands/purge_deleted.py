@@ -0,0 +1,31 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from reviews.purge import purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет помеченные удалёнными произведения и пользователей '
+        'вместе с их отзывами и комментариями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.PURGE_BATCH_SIZE,
+            help='Сколько строк удалять в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        totals = Counter()
+        for model, count in purge_deleted(options['batch_size']):
+            totals[model._meta.verbose_name_plural] += count
+            print(
+                f'{model._meta.verbose_name_plural}: удалено {count}, '
+                f'всего {totals[model._meta.verbose_name_plural]}'
+            )
+        print('Очистка завершена: ', dict(totals) or 'удалять нечего')
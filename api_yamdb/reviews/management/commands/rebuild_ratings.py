@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title, TopTitle
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги произведений по всем отзывам.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.rebuild_ratings()
+            TopTitle.sync()
+        print('Пересчитаны рейтинги произведений: ', updated)
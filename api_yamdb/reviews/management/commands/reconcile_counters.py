@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.models import Review, Title
+
+
+class Command(BaseCommand):
+    help = 'Сверяет счётчики отзывов и комментариев с данными в базе.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            titles = Title.rebuild_review_counts()
+            reviews = Review.rebuild_comment_counts()
+        print('Исправлены счётчики отзывов у произведений: ', titles)
+        print('Исправлены счётчики комментариев у отзывов: ', reviews)
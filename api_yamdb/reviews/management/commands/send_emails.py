@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from reviews.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Сколько писем читать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь снова.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах между проверками очереди с --loop.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = drain_outbox(options['batch_size'])
+            except OSError as error:
+                # Почтовый сервер недоступен: письма остаются в очереди.
+                if not options['loop']:
+                    raise
+                print('Не удалось подключиться к почтовому серверу: ', error)
+            else:
+                if sent or failed:
+                    print(f'Отправлено писем: {sent}, отложено: {failed}')
+                if not options['loop']:
+                    return
+            time.sleep(options['interval'])
@@ -0,0 +1,45 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    scores = Review.objects.filter(score__isnull=False).order_by().values(
+        'title'
+    ).annotate(
+        total=models.Sum('score'), count=models.Count('id')
+    )
+    for row in scores:
+        Title.objects.filter(id=row['title']).update(
+            score_sum=row['total'],
+            score_count=row['count'],
+            rating=row['total'] / row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+from reviews.search import TITLE_SEARCH_TABLE, normalize
+
+
+def fill_title_index(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [
+                (title_id, normalize(name), normalize(description))
+                for title_id, name, description in Title.objects.values_list(
+                    'id', 'name', 'description'
+                )
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_name_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f'CREATE VIRTUAL TABLE {TITLE_SEARCH_TABLE} USING fts5('
+            'name, description, '
+            "tokenize = 'unicode61 remove_diacritics 2')",
+            f'DROP TABLE {TITLE_SEARCH_TABLE}',
+        ),
+        migrations.RunPython(fill_title_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from api_yamdb.settings import TOP_TITLES_MIN_VOTES, TOP_TITLES_PRIOR_SCORE
+
+
+def fill_top_titles(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    TopTitle = apps.get_model('reviews', 'TopTitle')
+    titles = {
+        title_id: (
+            category_id,
+            (score_sum + TOP_TITLES_MIN_VOTES * TOP_TITLES_PRIOR_SCORE)
+            / (score_count + TOP_TITLES_MIN_VOTES)
+        )
+        for title_id, category_id, score_sum, score_count
+        in Title.objects.values_list(
+            'id', 'category_id', 'score_sum', 'score_count'
+        )
+    }
+    rows = [
+        TopTitle(title_id=title_id, category_id=category_id, score=score)
+        for title_id, (category_id, score) in titles.items()
+    ]
+    for title_id, genre_id in Title.genre.through.objects.values_list(
+        'title_id', 'genre_id'
+    ):
+        category_id, score = titles[title_id]
+        rows.append(TopTitle(
+            title_id=title_id, genre_id=genre_id,
+            category_id=category_id, score=score,
+        ))
+    TopTitle.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopTitle',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='top', to='reviews.Category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='top', to='reviews.Genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='top', to='reviews.Title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Лучшие произведения',
+                'default_related_name': 'top',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='toptitle',
+            index=models.Index(fields=['genre', '-score', 'title'], name='top_genre_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toptitle',
+            index=models.Index(fields=['genre', 'category', '-score', 'title'], name='top_genre_category_score_idx'),
+        ),
+        migrations.RunPython(fill_top_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+def fill_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    Comments = apps.get_model('reviews', 'Comments')
+    for row in Review.objects.order_by().values('title').annotate(
+        count=models.Count('id')
+    ):
+        Title.objects.filter(id=row['title']).update(
+            review_count=row['count']
+        )
+    for row in Comments.objects.filter(review__isnull=False).order_by(
+    ).values('review').annotate(count=models.Count('id')):
+        Review.objects.filter(id=row['review']).update(
+            comment_count=row['count']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_review_comments_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
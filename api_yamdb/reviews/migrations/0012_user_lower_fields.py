@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:36
+
+from django.db import migrations, models
+
+
+def fill_lower_fields(apps, schema_editor):
+    # LOWER в SQLite не меняет регистр букв вне ASCII.
+    User = apps.get_model('reviews', 'User')
+    users = []
+    for user in User.objects.only('id', 'username', 'email').iterator():
+        user.username_lower = user.username.lower()
+        user.email_lower = (user.email or '').lower()
+        users.append(user)
+    User.objects.bulk_update(
+        users, ('username_lower', 'email_lower'), batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=254, verbose_name='Электронная почта в нижнем регистре'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150, verbose_name='Имя пользователя в нижнем регистре'),
+        ),
+        migrations.RunPython(fill_lower_fields, migrations.RunPython.noop),
+    ]
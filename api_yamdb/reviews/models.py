@@ -1,8 +1,14 @@
+import time
+
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
-from api_yamdb.settings import TEXT_SCOPE
+from api_yamdb.settings import (
+    SIMPLE_JWT, TEXT_SCOPE, TOP_TITLES_MIN_VOTES, TOP_TITLES_PRIOR_SCORE
+)
 from reviews.validators import (
     UsernameValidation, get_now_year, YEAR_OVER_CURRENT
 )
@@ -13,6 +19,10 @@ ADMIN = 'admin'
 USERNAME_LENGTH = 150
 EMAIL_LENGTH = 254
 CONFIRMATION_CODE_LENGTH = 6
+# Поля пользователя и их копии в нижнем регистре для поиска по индексу.
+LOWER_FIELDS = {'username': 'username_lower', 'email': 'email_lower'}
+# Поля, от которых зависят права по утверждениям токена.
+TOKEN_FIELDS = ('role', 'is_staff', 'is_active', 'is_deleted')
 
 ROLES = (
     (USER, 'Пользователь'),
@@ -31,6 +41,10 @@ RATE_CHOICES = (
     (9, 'Удивительно'),
     (10, 'Невероятно'),
 )
+SCORE_FIELD = 'score_{}'
+SCORE_FIELDS = tuple(SCORE_FIELD.format(score) for score, _ in RATE_CHOICES)
+# Отзывы и комментарии, которые видны в API и входят в агрегаты.
+COUNTED = {'is_hidden': False, 'author__is_deleted': False}
 
 
 class User(AbstractUser, UsernameValidation):
@@ -71,6 +85,24 @@ class User(AbstractUser, UsernameValidation):
         max_length=CONFIRMATION_CODE_LENGTH,
         blank=True
     )
+    is_deleted = models.BooleanField(
+        'Удалён',
+        default=False,
+    )
+    username_lower = models.CharField(
+        'Имя пользователя в нижнем регистре',
+        max_length=USERNAME_LENGTH,
+        db_index=True,
+        editable=False,
+        default='',
+    )
+    email_lower = models.CharField(
+        'Электронная почта в нижнем регистре',
+        max_length=EMAIL_LENGTH,
+        db_index=True,
+        editable=False,
+        default='',
+    )
 
     REQUIRED_FIELDS = ['email']
 
@@ -91,6 +123,78 @@ class User(AbstractUser, UsernameValidation):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user.loaded_token_values = user.token_values()
+        return user
+
+    def token_values(self):
+        # Отложенные поля не загружаются ради сравнения.
+        return tuple(self.__dict__.get(field) for field in TOKEN_FIELDS)
+
+    def fill_lower_fields(self):
+        for field, lower_field in LOWER_FIELDS.items():
+            setattr(self, lower_field, (getattr(self, field) or '').lower())
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.fill_lower_fields()
+        if update_fields is not None:
+            update_fields = set(update_fields) | {
+                LOWER_FIELDS[field]
+                for field in update_fields if field in LOWER_FIELDS
+            }
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+    @classmethod
+    def soft_delete(cls, user_id):
+        cls.objects.filter(id=user_id).update(
+            is_deleted=True, is_active=False
+        )
+        # Отзывы и комментарии пользователя сразу перестают учитываться
+        # в агрегатах, хотя удаляются позже командой purge_deleted.
+        title_ids = set(Review.objects.filter(
+            author_id=user_id
+        ).order_by().values_list('title_id', flat=True).distinct())
+        review_ids = set(Comments.objects.filter(
+            author_id=user_id
+        ).order_by().values_list('review_id', flat=True).distinct())
+        Title.rebuild_ratings(title_ids)
+        Title.rebuild_review_counts(title_ids)
+        TopTitle.sync(title_ids)
+        Review.rebuild_comment_counts(review_ids)
+        transaction.on_commit(lambda: TokenRevocation.revoke(user_id))
+
+
+class TokenRevocation(models.Model):
+    # Без внешнего ключа: отметка переживает удаление пользователя.
+    user_id = models.PositiveIntegerField(
+        'Пользователь',
+        unique=True,
+    )
+    revoked_at = models.FloatField(
+        'Время отзыва',
+    )
+
+    class Meta:
+        verbose_name = 'Отзыв токенов'
+        verbose_name_plural = 'Отзывы токенов'
+
+    def __str__(self):
+        return str(self.user_id)
+
+    @classmethod
+    def revoke(cls, user_id):
+        """Отзывает токены пользователя, выпущенные до этого момента."""
+        revoked_at = time.time()
+        cls.objects.update_or_create(
+            user_id=user_id, defaults={'revoked_at': revoked_at}
+        )
+        # Отметки старше самого долгоживущего токена уже ничего не отзывают.
+        cls.objects.filter(revoked_at__lt=(
+            revoked_at - SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+        )).delete()
+
 
 class CategoryGenre(models.Model):
     name = models.CharField(
@@ -148,15 +252,162 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name='titles'
     )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+    )
+    score_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        blank=True,
+        null=True,
+    )
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+    )
+    is_deleted = models.BooleanField(
+        'Удалено',
+        default=False,
+    )
+    # Гистограмма оценок: поля SCORE_FIELDS по одному на RATE_CHOICES.
+    score_1 = models.PositiveIntegerField(
+        'Оценок «1»',
+        default=0,
+    )
+    score_2 = models.PositiveIntegerField(
+        'Оценок «2»',
+        default=0,
+    )
+    score_3 = models.PositiveIntegerField(
+        'Оценок «3»',
+        default=0,
+    )
+    score_4 = models.PositiveIntegerField(
+        'Оценок «4»',
+        default=0,
+    )
+    score_5 = models.PositiveIntegerField(
+        'Оценок «5»',
+        default=0,
+    )
+    score_6 = models.PositiveIntegerField(
+        'Оценок «6»',
+        default=0,
+    )
+    score_7 = models.PositiveIntegerField(
+        'Оценок «7»',
+        default=0,
+    )
+    score_8 = models.PositiveIntegerField(
+        'Оценок «8»',
+        default=0,
+    )
+    score_9 = models.PositiveIntegerField(
+        'Оценок «9»',
+        default=0,
+    )
+    score_10 = models.PositiveIntegerField(
+        'Оценок «10»',
+        default=0,
+    )
 
     class Meta:
         ordering = ['name', ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name[:TEXT_SCOPE]
 
+    @classmethod
+    def soft_delete(cls, title_id):
+        cls.objects.filter(id=title_id).update(is_deleted=True)
+        TopTitle.objects.filter(title_id=title_id).delete()
+
+    @property
+    def score_histogram(self):
+        return {
+            score: getattr(self, SCORE_FIELD.format(score))
+            for score, _ in RATE_CHOICES
+        }
+
+    @classmethod
+    def apply_score(cls, title_id, old_score=None, new_score=None,
+                    review_delta=0):
+        score_delta = (new_score or 0) - (old_score or 0)
+        count_delta = (new_score is not None) - (old_score is not None)
+        if not score_delta and not count_delta:
+            if review_delta:
+                cls.objects.filter(id=title_id).update(
+                    review_count=models.F('review_count') + review_delta
+                )
+            return
+        score_sum = models.F('score_sum') + score_delta
+        score_count = models.F('score_count') + count_delta
+        histogram = {}
+        if old_score is not None:
+            field = SCORE_FIELD.format(old_score)
+            histogram[field] = models.F(field) - 1
+        if new_score is not None:
+            field = SCORE_FIELD.format(new_score)
+            histogram[field] = models.F(field) + 1
+        # В UPDATE правые части видят старые значения строки,
+        # поэтому рейтинг считается по уже сдвинутым сумме и количеству.
+        cls.objects.filter(id=title_id).update(
+            score_sum=score_sum,
+            score_count=score_count,
+            rating=Cast(score_sum, models.FloatField()) / NullIf(
+                score_count, 0
+            ),
+            review_count=models.F('review_count') + review_delta,
+            **histogram,
+        )
+        TopTitle.refresh_scores(title_id)
+
+    @classmethod
+    def rebuild_ratings(cls, title_ids=None):
+        scores = Review.objects.filter(
+            title=models.OuterRef('pk'), score__isnull=False, **COUNTED
+        ).order_by().values('title')
+        titles = cls.objects.all()
+        if title_ids is not None:
+            titles = titles.filter(id__in=title_ids)
+        return titles.update(
+            score_sum=Coalesce(models.Subquery(
+                scores.annotate(total=models.Sum('score')).values('total'),
+                output_field=models.PositiveIntegerField(),
+            ), 0),
+            score_count=Coalesce(models.Subquery(
+                scores.annotate(total=models.Count('id')).values('total'),
+                output_field=models.PositiveIntegerField(),
+            ), 0),
+            rating=models.Subquery(
+                scores.annotate(total=models.Avg('score')).values('total'),
+                output_field=models.FloatField(),
+            ),
+            **{
+                SCORE_FIELD.format(score): count_subquery(
+                    Review, 'title', score=score, **COUNTED
+                )
+                for score, _ in RATE_CHOICES
+            },
+        )
+
+    @classmethod
+    def rebuild_review_counts(cls, title_ids=None):
+        count = count_subquery(Review, 'title', **COUNTED)
+        titles = cls.objects.exclude(review_count=count)
+        if title_ids is not None:
+            titles = titles.filter(id__in=title_ids)
+        return titles.update(review_count=count)
+
 
 class ReviewComments(models.Model):
     text = models.TextField(
@@ -172,6 +423,10 @@ class ReviewComments(models.Model):
         verbose_name='Автор',
         on_delete=models.CASCADE,
     )
+    is_hidden = models.BooleanField(
+        'Скрыт модератором',
+        default=False,
+    )
 
     class Meta:
         ordering = ['-pub_date', ]
@@ -192,11 +447,21 @@ class Review(ReviewComments):
         verbose_name='Произведение',
         on_delete=models.CASCADE,
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+    )
 
     class Meta(ReviewComments.Meta):
         default_related_name = 'reviews'
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date'),
+                name='review_title_pub_date_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('author', 'title'),
@@ -209,6 +474,20 @@ class Review(ReviewComments):
             f'{ReviewComments.__str__(self)} отзыв на {self.title}'
         )
 
+    @classmethod
+    def apply_comments(cls, review_id, delta):
+        cls.objects.filter(id=review_id).update(
+            comment_count=models.F('comment_count') + delta
+        )
+
+    @classmethod
+    def rebuild_comment_counts(cls, review_ids=None):
+        count = count_subquery(Comments, 'review', **COUNTED)
+        reviews = cls.objects.exclude(comment_count=count)
+        if review_ids is not None:
+            reviews = reviews.filter(id__in=review_ids)
+        return reviews.update(comment_count=count)
+
 
 class Comments(ReviewComments):
     review = models.ForeignKey(
@@ -223,3 +502,179 @@ class Comments(ReviewComments):
         default_related_name = 'comments'
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', '-pub_date'),
+                name='comments_review_pub_date_idx',
+            ),
+        ]
+
+
+def count_subquery(model, parent, **filters):
+    return Coalesce(models.Subquery(
+        model.objects.filter(
+            **{parent: models.OuterRef('pk')}, **filters
+        ).order_by().values(parent).annotate(
+            total=models.Count('id')
+        ).values('total'),
+        output_field=models.PositiveIntegerField(),
+    ), 0)
+
+
+def weighted_score(score_sum, score_count):
+    # Байесовская оценка: к отзывам добавляется TOP_TITLES_MIN_VOTES
+    # воображаемых оценок TOP_TITLES_PRIOR_SCORE.
+    return models.ExpressionWrapper(
+        (
+            Cast(score_sum, models.FloatField())
+            + TOP_TITLES_MIN_VOTES * TOP_TITLES_PRIOR_SCORE
+        ) / (score_count + TOP_TITLES_MIN_VOTES),
+        output_field=models.FloatField(),
+    )
+
+
+class TopTitle(models.Model):
+    title = models.ForeignKey(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+    )
+    genre = models.ForeignKey(
+        Genre,
+        verbose_name='Жанр',
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+    )
+    category = models.ForeignKey(
+        Category,
+        verbose_name='Категория',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+    )
+    score = models.FloatField(
+        'Взвешенный рейтинг',
+    )
+
+    class Meta:
+        default_related_name = 'top'
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Лучшие произведения'
+        # Строка с пустым жанром относится ко всем жанрам произведения.
+        indexes = [
+            models.Index(
+                fields=('genre', '-score', 'title'),
+                name='top_genre_score_idx',
+            ),
+            models.Index(
+                fields=('genre', 'category', '-score', 'title'),
+                name='top_genre_category_score_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title}: {self.score}'
+
+    @classmethod
+    def refresh_scores(cls, title_id):
+        title = Title.objects.filter(
+            id=models.OuterRef('title_id')
+        ).order_by()
+        cls.objects.filter(title_id=title_id).update(
+            score=models.Subquery(title.annotate(
+                weighted=weighted_score(
+                    models.F('score_sum'), models.F('score_count')
+                )
+            ).values('weighted'))
+        )
+
+    @classmethod
+    def sync(cls, title_ids=None):
+        titles = Title.objects.filter(is_deleted=False).annotate(
+            weighted=weighted_score(
+                models.F('score_sum'), models.F('score_count')
+            )
+        ).order_by()
+        genres = Title.genre.through.objects.order_by()
+        rows = cls.objects.all()
+        if title_ids is not None:
+            titles = titles.filter(id__in=title_ids)
+            genres = genres.filter(title_id__in=title_ids)
+            rows = rows.filter(title_id__in=title_ids)
+        titles = {
+            title_id: (category_id, weighted)
+            for title_id, category_id, weighted in titles.values_list(
+                'id', 'category_id', 'weighted'
+            )
+        }
+        rows.delete()
+        cls.objects.bulk_create(
+            [
+                cls(title_id=title_id, genre_id=None,
+                    category_id=category_id, score=weighted)
+                for title_id, (category_id, weighted) in titles.items()
+            ] + [
+                cls(title_id=title_id, genre_id=genre_id,
+                    category_id=titles[title_id][0],
+                    score=titles[title_id][1])
+                for title_id, genre_id in genres.values_list(
+                    'title_id', 'genre_id'
+                )
+                if title_id in titles
+            ],
+            batch_size=500,
+        )
+
+
+class OutboxEmail(models.Model):
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=EMAIL_LENGTH,
+    )
+    subject = models.CharField(
+        'Тема',
+        max_length=256,
+    )
+    message = models.TextField(
+        'Текст письма',
+    )
+    from_email = models.EmailField(
+        'Отправитель',
+        max_length=EMAIL_LENGTH,
+    )
+    created = models.DateTimeField(
+        'Дата создания',
+        auto_now_add=True,
+    )
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    sent = models.DateTimeField(
+        'Дата отправки',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        ordering = ['id', ]
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=('sent', 'next_attempt'),
+                name='outbox_sent_next_attempt_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject[:TEXT_SCOPE]}'
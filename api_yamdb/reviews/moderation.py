@@ -0,0 +1,49 @@
+from django.db import transaction
+
+from reviews.models import Comments, Review, Title, TopTitle
+from reviews.versions import bump_version
+
+DELETE = 'delete'
+HIDE = 'hide'
+ACTIONS = (
+    (DELETE, 'Удалить'),
+    (HIDE, 'Скрыть'),
+)
+
+
+def apply_action(queryset, action):
+    # Удаление без сборщика Django: он загрузил бы в память каждую
+    # строку вместе с зависимыми комментариями.
+    if action == HIDE:
+        return queryset.update(is_hidden=True)
+    return queryset._raw_delete(queryset.db)
+
+
+def moderate_reviews(queryset, action):
+    with transaction.atomic():
+        title_ids = set(
+            queryset.order_by().values_list('title_id', flat=True).distinct()
+        )
+        if action == DELETE:
+            apply_action(Comments.objects.filter(review__in=queryset), DELETE)
+        count = apply_action(queryset, action)
+        # Агрегаты затронутых произведений пересчитываются один раз
+        # по оставшимся отзывам.
+        Title.rebuild_ratings(title_ids)
+        Title.rebuild_review_counts(title_ids)
+        TopTitle.sync(title_ids)
+        for model in (Review, Comments, Title):
+            transaction.on_commit(lambda model=model: bump_version(model))
+    return count
+
+
+def moderate_comments(queryset, action):
+    with transaction.atomic():
+        review_ids = set(
+            queryset.order_by().values_list('review_id', flat=True).distinct()
+        )
+        count = apply_action(queryset, action)
+        Review.rebuild_comment_counts(review_ids)
+        for model in (Comments, Review):
+            transaction.on_commit(lambda model=model: bump_version(model))
+    return count
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import models, transaction
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+def enqueue_email(subject, message, recipient, from_email):
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        message=message,
+        recipient=recipient,
+        from_email=from_email,
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(lambda: drain_outbox(
+            1, emails=OutboxEmail.objects.filter(id=email.id)
+        ))
+    return email
+
+
+def due_emails():
+    return OutboxEmail.objects.filter(
+        sent__isnull=True,
+        next_attempt__lte=timezone.now(),
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def send_emails(emails, connection):
+    """Отправляет письма через открытое соединение с почтовым сервером.
+
+    Неудачные письма откладываются с растущей задержкой,
+    возвращает число отправленных и неудачных писем.
+    """
+    sent, failed = [], 0
+    for email in emails:
+        try:
+            connection.send_messages([EmailMessage(
+                subject=email.subject,
+                body=email.message,
+                from_email=email.from_email,
+                to=[email.recipient],
+            )])
+        except Exception as error:
+            failed += 1
+            OutboxEmail.objects.filter(id=email.id).update(
+                attempts=models.F('attempts') + 1,
+                next_attempt=timezone.now() + retry_delay(email.attempts + 1),
+                last_error=repr(error),
+            )
+        else:
+            sent.append(email.id)
+    OutboxEmail.objects.filter(id__in=sent).update(sent=timezone.now())
+    return len(sent), failed
+
+
+def drain_outbox(batch_size, emails=None, connection=None):
+    """Отправляет подошедшие письма пачками по batch_size.
+
+    Все пачки идут через одно соединение. Рассчитано на один
+    обработчик очереди.
+    """
+    emails = due_emails() if emails is None else emails & due_emails()
+    total_sent = total_failed = 0
+    with connection or get_connection() as connection:
+        while True:
+            # Неудачные письма в следующую пачку не попадут:
+            # их next_attempt уже в будущем.
+            batch = list(emails[:batch_size])
+            if not batch:
+                return total_sent, total_failed
+            sent, failed = send_emails(batch, connection)
+            total_sent += sent
+            total_failed += failed
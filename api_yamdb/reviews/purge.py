@@ -0,0 +1,59 @@
+from reviews.models import Comments, Review, Title, User
+from reviews.moderation import DELETE, moderate_comments, moderate_reviews
+
+
+def purge_batches(queryset, handler, batch_size):
+    """Удаляет строки пачками по batch_size, каждую в своей транзакции.
+
+    После каждой пачки возвращает модель и число удалённых строк.
+    """
+    while True:
+        ids = list(
+            queryset.order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        yield queryset.model, handler(
+            queryset.model.objects.filter(id__in=ids), DELETE
+        )
+
+
+def purge_title(title_id, batch_size):
+    yield from purge_batches(
+        Comments.objects.filter(review__title_id=title_id),
+        moderate_comments, batch_size
+    )
+    yield from purge_batches(
+        Review.objects.filter(title_id=title_id),
+        moderate_reviews, batch_size
+    )
+    Title.objects.get(id=title_id).delete()
+    yield Title, 1
+
+
+def purge_user(user_id, batch_size):
+    yield from purge_batches(
+        Comments.objects.filter(author_id=user_id),
+        moderate_comments, batch_size
+    )
+    yield from purge_batches(
+        Comments.objects.filter(review__author_id=user_id),
+        moderate_comments, batch_size
+    )
+    yield from purge_batches(
+        Review.objects.filter(author_id=user_id),
+        moderate_reviews, batch_size
+    )
+    User.objects.get(id=user_id).delete()
+    yield User, 1
+
+
+def purge_deleted(batch_size):
+    for title_id in Title.objects.filter(is_deleted=True).values_list(
+        'id', flat=True
+    ):
+        yield from purge_title(title_id, batch_size)
+    for user_id in User.objects.filter(is_deleted=True).values_list(
+        'id', flat=True
+    ):
+        yield from purge_user(user_id, batch_size)
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from django.conf import settings
+
+from reviews.models import TokenRevocation
+from reviews.versions import get_versions
+
+
+class RevocationSnapshot:
+    """Отметки отзыва токенов в памяти процесса.
+
+    Перечитываются из базы, когда меняется версия отметок или истекает
+    TOKEN_REVOCATION_REFRESH. Вытеснение версии из кэша тоже меняет её,
+    поэтому отметки не теряются.
+    """
+
+    def __init__(self, refresh):
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded = 0
+        self.revoked = {}
+
+    def revoked_at(self, user_id):
+        version = get_versions(TokenRevocation)
+        now = time.monotonic()
+        with self.lock:
+            if version != self.version or now - self.loaded > self.refresh:
+                self.revoked = dict(TokenRevocation.objects.values_list(
+                    'user_id', 'revoked_at'
+                ))
+                self.version = version
+                self.loaded = now
+            return self.revoked.get(user_id)
+
+
+revocations = RevocationSnapshot(settings.TOKEN_REVOCATION_REFRESH)
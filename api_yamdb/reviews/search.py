@@ -0,0 +1,98 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+SEARCH_RANK = 'search_rank'
+# Вес совпадений в названии выше, чем в описании.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+WORD = re.compile(r'\w+')
+
+
+def normalize(text):
+    # unicode61 не считает «ё» буквой «е» с диакритикой.
+    return (text or '').lower().replace('ё', 'е')
+
+
+def match_expression(text, column=None):
+    words = WORD.findall(normalize(text))
+    if not words:
+        return None
+    expression = ' '.join(f'"{word}"*' for word in words)
+    if column is None:
+        return expression
+    return f'{column} : ({expression})'
+
+
+def index_titles(titles):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s',
+            [(title.id,) for title in titles]
+        )
+        cursor.executemany(
+            f'INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [
+                (title.id, normalize(title.name), normalize(title.description))
+                for title in titles
+            ]
+        )
+
+
+def index_title(title):
+    index_titles([title])
+
+
+def unindex_title(title_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {TITLE_SEARCH_TABLE} WHERE rowid = %s',
+            [title_id]
+        )
+
+
+def rebuild_title_index():
+    from reviews.models import Title
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TITLE_SEARCH_TABLE}')
+        cursor.executemany(
+            f'INSERT INTO {TITLE_SEARCH_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [
+                (title_id, normalize(name), normalize(description))
+                for title_id, name, description in Title.objects.values_list(
+                    'id', 'name', 'description'
+                ).iterator()
+            ]
+        )
+
+
+def search_titles(queryset, text, column=None):
+    expression = match_expression(text, column)
+    if expression is None:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    # RawSQL в `id__in` оборачивается в лишние скобки, и SQLite
+    # сравнивает id только с первой строкой подзапроса.
+    queryset = queryset.extra(
+        where=[
+            f'"{table}"."id" IN (SELECT rowid FROM {TITLE_SEARCH_TABLE} '
+            f'WHERE {TITLE_SEARCH_TABLE} MATCH %s)'
+        ],
+        params=[expression],
+    )
+    if SEARCH_RANK in queryset.query.annotations:
+        return queryset
+    return queryset.annotate(**{SEARCH_RANK: RawSQL(
+        f'SELECT bm25({TITLE_SEARCH_TABLE}, %s, %s) '
+        f'FROM {TITLE_SEARCH_TABLE} '
+        f'WHERE {TITLE_SEARCH_TABLE} MATCH %s '
+        f'AND rowid = "{table}"."id"',
+        (NAME_WEIGHT, DESCRIPTION_WEIGHT, expression),
+        output_field=FloatField(),
+    )})
@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category, Comments, Genre, Review, Title, TokenRevocation, TopTitle,
+    User
+)
+from reviews.search import index_title, unindex_title
+from reviews.user_cache import user_cache
+from reviews.versions import bump_version
+
+SERVICE_USER_FIELDS = {'confirmation_code', 'last_login', 'password'}
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    index_title(instance)
+    TopTitle.sync([instance.id])
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    unindex_title(instance.id)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+@receiver(post_delete, sender=User)
+def model_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        TopTitle.sync([instance.id])
+    elif pk_set:
+        TopTitle.sync(pk_set)
+    else:
+        # post_clear со стороны жанра не сообщает, какие
+        # произведения затронуты.
+        TopTitle.sync()
+    transaction.on_commit(lambda: bump_version(Title))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    user_cache.forget(instance.id)
+
+
+@receiver(post_save, sender=User)
+def user_tokens_changed(sender, instance, created, **kwargs):
+    values = instance.token_values()
+    if not created and values != getattr(
+        instance, 'loaded_token_values', None
+    ):
+        transaction.on_commit(
+            lambda: TokenRevocation.revoke(instance.id)
+        )
+    instance.loaded_token_values = values
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # После удаления Django обнуляет id экземпляра.
+    user_id = instance.id
+    transaction.on_commit(lambda: TokenRevocation.revoke(user_id))
+
+
+@receiver(post_save, sender=TokenRevocation)
+@receiver(post_delete, sender=TokenRevocation)
+def token_revocation_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(TokenRevocation))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, update_fields=None, **kwargs):
+    # Код подтверждения не попадает в ответы API.
+    if update_fields and set(update_fields) <= SERVICE_USER_FIELDS:
+        return
+    transaction.on_commit(lambda: bump_version(User))
@@ -0,0 +1,84 @@
+import json
+import threading
+from collections import defaultdict
+
+from reviews.models import Category, Genre, Title
+from reviews.versions import get_versions
+
+
+def to_ids(mask):
+    bits = bin(mask)[:1:-1]
+    ids = []
+    position = bits.find('1')
+    while position != -1:
+        ids.append(position)
+        position = bits.find('1', position + 1)
+    return ids
+
+
+class TitleIndex:
+    """Битовые маски id произведений по жанру, категории и году.
+
+    Индекс живёт в памяти процесса и перестраивается, когда меняется
+    версия произведений, жанров или категорий.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.masks = {}
+
+    def load(self):
+        masks = {
+            'genre': defaultdict(int),
+            'category': defaultdict(int),
+            'year': defaultdict(int),
+        }
+        titles = Title.objects.order_by().values_list(
+            'id', 'year', 'category__slug'
+        )
+        for title_id, year, category in titles.iterator():
+            bit = 1 << title_id
+            masks['year'][year] |= bit
+            if category is not None:
+                masks['category'][category] |= bit
+        genres = Title.genre.through.objects.order_by().values_list(
+            'title_id', 'genre__slug'
+        )
+        for title_id, genre in genres.iterator():
+            masks['genre'][genre] |= 1 << title_id
+        return {field: dict(values) for field, values in masks.items()}
+
+    def get_masks(self):
+        version = get_versions(Title, Genre, Category)
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    self.masks = self.load()
+                    self.version = version
+        return self.masks
+
+    def match(self, **values):
+        """Значения одного поля объединяются, разные поля пересекаются."""
+        masks = self.get_masks()
+        result = None
+        for field, field_values in values.items():
+            mask = 0
+            for value in field_values:
+                mask |= masks[field].get(value, 0)
+            result = mask if result is None else result & mask
+            if not result:
+                return []
+        return to_ids(result)
+
+
+def filter_by_ids(queryset, ids):
+    table = queryset.model._meta.db_table
+    # Один параметр вместо списка: SQLite ограничивает число переменных.
+    return queryset.extra(
+        where=[f'"{table}"."id" IN (SELECT value FROM json_each(%s))'],
+        params=[json.dumps(ids)],
+    )
+
+
+title_index = TitleIndex()
@@ -0,0 +1,47 @@
+import copy
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from reviews.models import User
+from reviews.versions import get_versions
+
+
+class UserCache:
+    """LRU-кэш пользователей в памяти процесса.
+
+    Сбрасывается целиком, когда меняется версия пользователей, поэтому
+    изменения из других процессов тоже видны. Возвращает копии,
+    чтобы запрос не менял общий экземпляр.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.version = None
+        self.users = OrderedDict()
+
+    def get(self, user_id):
+        version = get_versions(User)
+        with self.lock:
+            if version != self.version:
+                self.users.clear()
+                self.version = version
+            user = self.users.get(user_id)
+            if user is not None:
+                self.users.move_to_end(user_id)
+                return copy.copy(user)
+        user = User.objects.get(id=user_id)
+        with self.lock:
+            self.users[user_id] = user
+            while len(self.users) > self.size:
+                self.users.popitem(last=False)
+        return copy.copy(user)
+
+    def forget(self, user_id):
+        with self.lock:
+            self.users.pop(user_id, None)
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE)
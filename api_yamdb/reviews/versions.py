@@ -0,0 +1,32 @@
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY = 'version:{label}'
+
+
+def version_key(model):
+    return VERSION_KEY.format(label=model._meta.label_lower)
+
+
+def initial_version():
+    # Версия - время изменения в наносекундах: созданная заново после
+    # очистки кэша версия не совпадёт с уже выданной.
+    return time.time_ns()
+
+
+def get_versions(*models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_version(model):
+    key = version_key(model)
+    version = max(cache.get(key, 0) + 1, initial_version())
+    cache.set(key, version, timeout=None)
+    return version
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def email_outbox_eager(settings):
+    # письма из очереди уходят сразу, как ждут проверки регистрации
+    settings.EMAIL_OUTBOX_EAGER = True
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    from api.throttling import local_store
+
+    # бюджеты запросов не переходят из теста в тест
+    local_store.clear()
@@ -0,0 +1,47 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test08TitleQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_list_queries(
+            self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        # статистика таблицы, count, страница произведений
+        # с категориями, жанры страницы
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        for number in range(5):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}', 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            })
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 7, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` '
+            'количество запросов к базе не зависит от числа произведений'
+        )
+        with django_assert_num_queries(2):
+            response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == 7, (
+            'Проверьте, что число произведений без фильтров '
+            'берётся из кэша, пока произведения не менялись'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(
+            self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert len(response.json()['genre']) == 2, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` '
+            'жанры произведения загружаются одним запросом'
+        )
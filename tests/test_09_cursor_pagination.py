@@ -0,0 +1,120 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test09CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(12):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number:02}', 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            })
+        response = client.get('/api/v1/titles/?cursor=')
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?cursor=` '
+            'курсорная пагинация не считает общее количество объектов'
+        )
+        names = [title['name'] for title in data['results']]
+        response = client.get(data['next'])
+        data = response.json()
+        names += [title['name'] for title in data['results']]
+        assert data['next'] is None
+        assert names == sorted(names) and len(names) == 14, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает все произведения по порядку `name`'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 14, (
+            'Проверьте, что без параметра `cursor` `/api/v1/titles/` '
+            'использует пагинацию по номеру страницы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_comments_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_id = titles[0]['id']
+        review_id = reviews[0]['id']
+        response = client.get(f'/api/v1/titles/{title_id}/reviews/?cursor=')
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            'Проверьте, что курсорная пагинация отзывов '
+            'возвращает новые отзывы первыми'
+        )
+        url = f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        response = client.get(url + '?cursor=')
+        data = response.json()
+        assert len(data['results']) == len(comments)
+        assert 'count' not in data
+        response = client.get(url)
+        assert response.json()['count'] == len(comments), (
+            'Проверьте, что без параметра `cursor` комментарии '
+            'используют пагинацию limit/offset'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_duplicate_names_keyset(
+            self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data=[
+            {
+                'name': 'Двойник', 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            }
+            for _ in range(25)
+        ], format='json')
+        ids = []
+        url = '/api/v1/titles/?cursor=&fields=id,name'
+        pages = []
+        while url:
+            with django_assert_num_queries(1) as context:
+                data = client.get(url).json()
+            query = context.captured_queries[0]['sql']
+            assert 'OFFSET' not in query, (
+                'Проверьте, что курсор выбирает страницу сравнением '
+                'значений сортировки, а не смещением'
+            )
+            pages.append(url)
+            ids += [title['id'] for title in data['results']]
+            url = data['next']
+        assert len(ids) == len(set(ids)) == 27 and len(pages) == 3
+        data = client.get(pages[-1]).json()
+        previous = client.get(data['previous']).json()
+        assert [title['id'] for title in previous['results']] == ids[10:20], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу'
+        )
+        assert previous['next'] is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_tampered_cursor(self, client, admin_client, admin):
+        import base64
+        from urllib.parse import urlencode
+
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for url, positions in (
+            ('/api/v1/titles/', ('[null, 1]', '["x", "y"]', '["x", [1]]')),
+            (reviews_url, (
+                '["x", 1]', '[{"a": 1}, 1]', '[null, 1]', '[[1], 1]',
+                '["2020-01-01T00:00:00+00:00", "y"]',
+            )),
+        ):
+            for position in positions:
+                cursor = base64.b64encode(
+                    urlencode({'p': position}).encode()
+                ).decode()
+                response = client.get(url, {'cursor': cursor})
+                assert response.status_code == 404, (
+                    f'Проверьте, что подделанный курсор `{position}` '
+                    f'на `{url}` возвращает 404'
+                )
@@ -0,0 +1,75 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test10TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_name_filter(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?name=ПОВОР')
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что фильтр `name` в `/api/v1/titles/` ищет '
+            'по началу слов в названии без учёта регистра'
+        )
+        response = client.get('/api/v1/titles/?name=драма')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что фильтр `name` в `/api/v1/titles/` '
+            'не ищет по описанию произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_search_rank(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'description': 'Ещё одна драма'
+        })
+        response = client.get('/api/v1/titles/?search=Драма')
+        data = response.json()
+        assert data['count'] == 2, (
+            'Проверьте, что `search` в `/api/v1/titles/` ищет '
+            'по названию и описанию произведения'
+        )
+        response = client.get('/api/v1/titles/?search=ёще')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что `search` в `/api/v1/titles/` не различает `е` и `ё`'
+        )
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Драма', 'year': 2001, 'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+        })
+        response = client.get('/api/v1/titles/?search=драма')
+        assert response.json()['results'][0]['name'] == 'Драма', (
+            'Проверьте, что `search` в `/api/v1/titles/` ставит выше '
+            'совпадения в названии'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        response = client.get('/api/v1/titles/?search=главная')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удалённые произведения исчезают из поиска'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_search_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        for number in range(12):
+            admin_client.post('/api/v1/titles/', data={
+                'name': 'Сериал ' + 'сериал ' * number, 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            })
+        response = client.get(
+            '/api/v1/titles/', {'search': 'сериал', 'cursor': ''}
+        )
+        data = response.json()
+        ids = [title['id'] for title in data['results']]
+        ids += [title['id'] for title in client.get(data['next']).json()[
+            'results'
+        ]]
+        assert len(set(ids)) == 12, (
+            'Проверьте, что курсорная пагинация работает вместе с `search`'
+        )
@@ -0,0 +1,61 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test11TitleIndex:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_exact_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?genre=comed')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что фильтр `genre` в `/api/v1/titles/` '
+            'сравнивает slug жанра целиком'
+        )
+        response = client.get(
+            f'/api/v1/titles/?genre={genres[0]["slug"]}'
+            f'&category={categories[0]["slug"]}&year=2000'
+        )
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что фильтры `genre`, `category` и `year` '
+            'в `/api/v1/titles/` применяются вместе'
+        )
+        response = client.get(
+            f'/api/v1/titles/?genre={genres[0]["slug"]}&year=2020'
+        )
+        assert response.json()['count'] == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_multi_value_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get(
+            f'/api/v1/titles/?genre={genres[0]["slug"]},{genres[2]["slug"]}'
+        )
+        assert response.json()['count'] == 2, (
+            'Проверьте, что `genre=slug1,slug2` в `/api/v1/titles/` '
+            'возвращает произведения любого из жанров'
+        )
+        response = client.get('/api/v1/titles/?year=1999,2020')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_index_refresh(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?genre={genres[2]["slug"]}'
+        assert client.get(url).json()['count'] == 1
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'genre': [genres[2]['slug']]
+        })
+        assert client.get(url).json()['count'] == 2, (
+            'Проверьте, что фильтр `genre` учитывает изменение '
+            'жанров произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что фильтр `genre` учитывает удаление произведения'
+        )
@@ -0,0 +1,58 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test12ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cache(
+            self, client, admin_client, django_assert_num_queries
+    ):
+        titles, _, genres = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что повторный анонимный GET `/api/v1/titles/` '
+            'отдаётся из кэша'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert client.get('/api/v1/titles/').json()['count'] == 1, (
+            'Проверьте, что удаление произведения сбрасывает кэш '
+            '`/api/v1/titles/`'
+        )
+        url = f'/api/v1/titles/?genre={genres[2]["slug"]}'
+        assert client.get(url).json()['count'] == 0
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={
+            'genre': [genres[2]['slug']]
+        })
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что изменение жанров произведения сбрасывает кэш'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_rating_cache(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] == 4
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            data={'score': 8}
+        )
+        assert client.get(url).json()['rating'] == 5, (
+            'Проверьте, что изменение отзыва сбрасывает кэш произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_categories_genres_cache(self, client, admin_client):
+        for url in ('/api/v1/categories/', '/api/v1/genres/'):
+            assert client.get(url).json()['count'] == 0
+            admin_client.post(url, data={'name': 'Новое', 'slug': 'new'})
+            assert client.get(url).json()['count'] == 1, (
+                f'Проверьте, что создание объекта сбрасывает кэш `{url}`'
+            )
+            admin_client.delete(f'{url}new/')
+            assert client.get(url).json()['count'] == 0, (
+                f'Проверьте, что удаление объекта сбрасывает кэш `{url}`'
+            )
@@ -0,0 +1,88 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test13ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_etag(
+            self, client, admin_client, admin, django_assert_num_queries
+    ):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        for url in (
+            '/api/v1/titles/', title_url, f'{title_url}reviews/',
+            review_url, f'{review_url}comments/',
+        ):
+            response = client.get(url)
+            etag = response['ETag']
+            assert not response.has_header('Last-Modified'), (
+                'Проверьте, что ответ не содержит Last-Modified с '
+                'точностью до секунды'
+            )
+            with django_assert_num_queries(0):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Проверьте, что GET `{url}` с If-None-Match '
+                'неизменённого ресурса возвращает статус 304'
+            )
+        etag = client.get(f'{review_url}comments/')['ETag']
+        admin_client.post(f'{review_url}comments/', data={'text': 'Новый'})
+        response = client.get(
+            f'{review_url}comments/', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что новый комментарий меняет ETag списка комментариев'
+        )
+        etag = client.get(title_url)['ETag']
+        admin_client.delete(review_url)
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что удаление отзыва меняет ETag произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_if_modified_since(self, client, admin_client, admin):
+        from django.utils.http import http_date
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        admin_client.patch(
+            f'{url}{reviews[0]["id"]}/', data={'text': 'Правка'}
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        assert response.status_code == 200, (
+            'Проверьте, что If-Modified-Since не подтверждает ресурс, '
+            'изменённый в ту же секунду'
+        )
+        assert 'Правка' in {
+            review['text'] for review in response.json()['results']
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_parent(self, client, admin_client, admin):
+        from reviews.models import Review, Title
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        etag = client.get(f'{review_url}comments/')['ETag']
+        Review.objects.filter(id=reviews[0]['id']).delete()
+        response = client.get(
+            f'{review_url}comments/', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code != 304, (
+            'Проверьте, что ETag комментариев удалённого отзыва '
+            'больше не подтверждается'
+        )
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        etag = client.get(url)['ETag']
+        Title.objects.filter(id=titles[1]['id']).delete()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 404, (
+            'Проверьте, что ETag отзывов удалённого произведения '
+            'без отзывов больше не подтверждается'
+        )
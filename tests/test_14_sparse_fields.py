@@ -0,0 +1,47 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test14SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(
+            self, client, admin_client, django_assert_num_queries
+    ):
+        create_titles(admin_client)
+        # статистика таблицы, count и страница произведений
+        # без жанров и категорий
+        with django_assert_num_queries(3) as context:
+            response = client.get('/api/v1/titles/?fields=id,name,rating')
+        page_query = context.captured_queries[-1]['sql']
+        assert 'reviews_category' not in page_query
+        assert 'description' not in page_query
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                'Проверьте, что `fields` в `/api/v1/titles/` '
+                'оставляет в ответе только запрошенные поля'
+            )
+        response = client.get('/api/v1/titles/?fields=name,genre')
+        assert set(response.json()['results'][0]) == {'name', 'genre'}
+        response = client.get('/api/v1/titles/?fields=unknown')
+        assert 'category' in response.json()['results'][0], (
+            'Проверьте, что неизвестные поля в `fields` не ломают ответ'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_comments_fields(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url + '?fields=id,score')
+        for review in response.json()['results']:
+            assert set(review) == {'id', 'score'}, (
+                'Проверьте, что `fields` в списке отзывов '
+                'оставляет в ответе только запрошенные поля'
+            )
+        url += f'{reviews[0]["id"]}/comments/'
+        response = client.get(url + '?fields=text,author')
+        assert {
+            (comment['text'], comment['author'])
+            for comment in response.json()['results']
+        } == {(comment['text'], comment['author']) for comment in comments}
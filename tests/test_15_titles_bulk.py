@@ -0,0 +1,78 @@
+import pytest
+
+from .common import create_categories, create_genre
+
+
+class Test15TitlesBulk:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_bulk_create(
+            self, client, admin_client, django_assert_max_num_queries
+    ):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': f'Произведение {number}', 'year': 2000 + number,
+                'genre': [genre['slug'] for genre in genres[:number % 3 + 1]],
+                'category': categories[number % 2]['slug'],
+            }
+            for number in range(20)
+        ]
+        with django_assert_max_num_queries(15):
+            response = admin_client.post(
+                '/api/v1/titles/', data=data, format='json'
+            )
+        assert response.status_code == 201, (
+            'Проверьте, что POST списка произведений на `/api/v1/titles/` '
+            'возвращает статус 201'
+        )
+        created = response.json()
+        assert [title['name'] for title in created] == [
+            title['name'] for title in data
+        ]
+        assert [sorted(title['genre']) for title in created] == [
+            sorted(title['genre']) for title in data
+        ]
+        response = client.get(f'/api/v1/titles/{created[5]["id"]}/')
+        assert response.json()['name'] == 'Произведение 5'
+        response = client.get('/api/v1/titles/?search=произведение')
+        assert response.json()['count'] == 20, (
+            'Проверьте, что созданные списком произведения '
+            'доступны в поиске'
+        )
+        response = client.get(f'/api/v1/titles/?genre={genres[2]["slug"]}')
+        assert response.json()['count'] == 6
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_bulk_errors(self, admin_client, user_client):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {'name': 'Верно', 'year': 2000, 'genre': [genres[0]['slug']],
+             'category': categories[0]['slug']},
+            {'name': 'Неверно', 'year': 2000, 'genre': ['unknown'],
+             'category': categories[0]['slug']},
+            {'name': 'Без категории', 'year': 2000,
+             'genre': [genres[0]['slug']], 'category': 'unknown'},
+        ]
+        response = user_client.post(
+            '/api/v1/titles/', data=data, format='json'
+        )
+        assert response.status_code == 403
+        response = admin_client.post(
+            '/api/v1/titles/', data=data, format='json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что POST списка произведений с ошибками '
+            'возвращает статус 400'
+        )
+        errors = response.json()
+        assert errors[0] == {} and 'genre' in errors[1] and (
+            'category' in errors[2]
+        ), (
+            'Проверьте, что ошибки возвращаются для каждого произведения'
+        )
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0, (
+            'Проверьте, что при ошибках не создаётся ни одно произведение'
+        )
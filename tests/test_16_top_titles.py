@@ -0,0 +1,93 @@
+import pytest
+from django.db import connection
+
+from .common import create_reviews
+
+
+class Test16TopTitles:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top_titles(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/top/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET `/api/v1/titles/top/` возвращает статус 200'
+        )
+        data = response.json()
+        assert [title['id'] for title in data] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` учитывает число отзывов: '
+            'произведение без отзывов получает априорную оценку'
+        )
+        assert data[1]['weighted_rating'] == pytest.approx(
+            (5 + 3 + 4 + 5 * 5.5) / (3 + 5)
+        )
+        response = client.get(
+            f'/api/v1/titles/top/?genre={titles[0]["genre"][0]}'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[0]['id']
+        ]
+        response = client.get(
+            f'/api/v1/titles/top/?category={titles[1]["category"]}&limit=1'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ]
+        assert client.get('/api/v1/titles/top/?limit=0').status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_top_titles_update(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        for review in reviews:
+            admin_client.patch(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/',
+                data={'score': 10}
+            )
+        response = client.get('/api/v1/titles/top/')
+        assert response.json()[0]['id'] == titles[0]['id'], (
+            'Проверьте, что `/api/v1/titles/top/` обновляется '
+            'при изменении оценок'
+        )
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={
+            'genre': titles[0]['genre']
+        })
+        response = client.get(
+            f'/api/v1/titles/top/?genre={titles[0]["genre"][0]}'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            'Проверьте, что `/api/v1/titles/top/` учитывает '
+            'изменение жанров произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get('/api/v1/titles/top/')
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id']
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_top_titles_plan(
+            self, client, admin_client, admin, django_assert_max_num_queries
+    ):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        genre = titles[0]['genre'][0]
+        category = titles[1]['category']
+        for params in (
+            '', f'?genre={genre}', f'?category={category}',
+            f'?genre={genre}&category={category}',
+        ):
+            with django_assert_max_num_queries(2) as context:
+                client.get(f'/api/v1/titles/top/{params}')
+            query = context.captured_queries[0]['sql']
+            assert 'FROM "reviews_toptitle"' in query
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {query}')
+                plan = ' '.join(row[3] for row in cursor.fetchall())
+            assert 'USING' in plan and 'INDEX top_genre' in plan, plan
+            assert 'TEMP B-TREE' not in plan, (
+                'Проверьте, что `/api/v1/titles/top/` читает лучшие '
+                'произведения по индексу без сортировки'
+            )
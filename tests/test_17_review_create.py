@@ -0,0 +1,37 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test17ReviewCreate:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_create_queries(
+            self, admin_client, django_assert_max_num_queries
+    ):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # BEGIN, произведение, вставка отзыва, рейтинг произведения
+        # и взвешенный рейтинг; пользователь берётся из кэша
+        with django_assert_max_num_queries(5) as context:
+            response = admin_client.post(url, data={'text': 'Да', 'score': 5})
+        assert response.status_code == 201
+        assert sum(
+            query['sql'].startswith('SELECT')
+            for query in context.captured_queries
+        ) == 1, (
+            'Проверьте, что при создании отзыва произведение '
+            'загружается один раз, а повтор не проверяется запросом'
+        )
+        response = admin_client.post(url, data={'text': 'Нет', 'score': 1})
+        assert response.status_code == 400
+        assert response.json() == {'non_field_errors': [
+            'Нельзя оставить больше одного отзыва '
+            'на выбранное произведение.'
+        ]}, (
+            'Проверьте, что повторный отзыв возвращает прежнее сообщение'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 5, (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг'
+        )
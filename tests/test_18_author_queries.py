@@ -0,0 +1,53 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test18AuthorQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_author_queries(
+            self, client, admin_client, admin, django_assert_num_queries
+    ):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        # произведение со счётчиком отзывов и страница отзывов
+        # вместе с авторами
+        with django_assert_num_queries(2) as context:
+            response = client.get(url)
+        assert {
+            review['author'] for review in response.json()['results']
+        } == {review['author'] for review in reviews}, (
+            'Проверьте, что отзывы выводят `username` автора'
+        )
+        page_query = context.captured_queries[-1]['sql']
+        assert '"reviews_user"."username"' in page_query
+        assert '"reviews_user"."email"' not in page_query, (
+            'Проверьте, что для отзывов загружается только `username` автора'
+        )
+        with django_assert_num_queries(2):
+            response = client.get(f'{url}{reviews[1]["id"]}/')
+        assert response.json()['author'] == reviews[1]['author']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_author_queries(
+            self, client, admin_client, admin, django_assert_max_num_queries
+    ):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        with django_assert_max_num_queries(3) as context:
+            response = client.get(url)
+        assert {
+            comment['author'] for comment in response.json()['results']
+        } == {comment['author'] for comment in comments}, (
+            'Проверьте, что комментарии выводят `username` автора'
+        )
+        assert '"reviews_user"."email"' not in (
+            context.captured_queries[-1]['sql']
+        )
+        with django_assert_max_num_queries(2):
+            response = client.get(f'{url}{comments[2]["id"]}/')
+        assert response.json()['author'] == comments[2]['author']
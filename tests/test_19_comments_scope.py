@@ -0,0 +1,36 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test19CommentsScope:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comments_title_scope(
+            self, client, admin_client, admin, django_assert_num_queries
+    ):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        # count и страница комментариев без загрузки отзыва
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.json()['count'] == len(comments)
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        )
+        response = client.get(wrong_url)
+        assert response.json()['count'] == 0, (
+            'Проверьте, что комментарии ищутся по паре '
+            '`title_id` и `review_id`'
+        )
+        response = client.get(f'{wrong_url}{comments[0]["id"]}/')
+        assert response.status_code == 404
+        response = admin_client.post(wrong_url, data={'text': 'Мимо'})
+        assert response.status_code == 404, (
+            'Проверьте, что нельзя прокомментировать отзыв '
+            'через чужое произведение'
+        )
@@ -0,0 +1,43 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments
+
+
+class Test20Counters:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_counters(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        assert client.get(title_url).json()['review_count'] == len(
+            reviews
+        ), 'Проверьте, что у произведения выводится число отзывов'
+        assert client.get(review_url).json()['comment_count'] == len(
+            comments
+        ), 'Проверьте, что у отзыва выводится число комментариев'
+        admin_client.delete(f'{review_url}comments/{comments[0]["id"]}/')
+        assert client.get(review_url).json()['comment_count'] == len(
+            comments
+        ) - 1, 'Проверьте, что удаление комментария уменьшает счётчик'
+        admin_client.delete(review_url)
+        assert client.get(title_url).json()['review_count'] == len(
+            reviews
+        ) - 1, 'Проверьте, что удаление отзыва уменьшает счётчик'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reconcile_counters(self, client, admin_client, admin):
+        from reviews.models import Review, Title
+
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        Title.objects.update(review_count=100)
+        Review.objects.update(comment_count=100)
+        call_command('reconcile_counters')
+        assert Title.objects.get(id=titles[0]['id']).review_count == len(
+            reviews
+        ), 'Проверьте, что команда пересчитывает счётчики отзывов'
+        assert Title.objects.get(id=titles[1]['id']).review_count == 0
+        assert Review.objects.get(id=reviews[0]['id']).comment_count == len(
+            comments
+        ), 'Проверьте, что команда пересчитывает счётчики комментариев'
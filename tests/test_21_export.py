@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from .common import auth_client, create_comments
+
+
+class Test21Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        url = '/api/v1/export/reviews/'
+        assert client.get(url).status_code == 401
+        assert auth_client(user).get(url).status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert {row['id'] for row in rows} == {
+            review['id'] for review in reviews
+        }
+        assert rows[0]['author'] == reviews[0]['author']
+        assert rows[0]['title'] == titles[0]['id']
+        response = admin_client.get('/api/v1/export/comments/')
+        rows = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        assert len(rows) == len(comments)
+        assert rows[0]['review'] == reviews[0]['id']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_since(self, admin_client, admin):
+        create_comments(admin_client, admin)
+        response = admin_client.get(
+            '/api/v1/export/reviews/', {'since': '2999-01-01T00:00:00'}
+        )
+        assert b''.join(response.streaming_content) == b'', (
+            'Проверьте, что параметр `since` отсекает старые записи'
+        )
+        response = admin_client.get(
+            '/api/v1/export/reviews/', {'since': 'вчера'}
+        )
+        assert response.status_code == 400
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_hidden_review_comments(self, admin_client, admin):
+        from reviews.models import Review
+
+        _, reviews, _, _, _ = create_comments(admin_client, admin)
+        Review.objects.filter(id=reviews[0]['id']).update(is_hidden=True)
+        response = admin_client.get('/api/v1/export/comments/')
+        assert not b''.join(response.streaming_content), (
+            'Проверьте, что выгрузка комментариев пропускает комментарии '
+            'к скрытым отзывам'
+        )
@@ -0,0 +1,61 @@
+import pytest
+
+from .common import create_reviews
+
+
+class Test22TitleScores:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_scores(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/scores/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            'Проверьте, что `/titles/{id}/scores/` доступен без токена'
+        )
+        scores = response.json()['scores']
+        assert scores == {
+            str(score): sum(review['score'] == score for review in reviews)
+            for score in range(1, 11)
+        }, 'Проверьте, что гистограмма учитывает все оценки произведения'
+        review_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        admin_client.patch(review_url, data={'score': 9})
+        scores = client.get(url).json()['scores']
+        assert scores[str(reviews[0]['score'])] == 0
+        assert scores['9'] == 1, (
+            'Проверьте, что изменение оценки переносит её в гистограмме'
+        )
+        admin_client.delete(review_url)
+        assert client.get(url).json()['scores']['9'] == 0, (
+            'Проверьте, что удаление отзыва убирает оценку из гистограммы'
+        )
+        assert client.get('/api/v1/titles/100500/scores/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_scores_batch(
+            self, client, admin_client, admin, django_assert_num_queries
+    ):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        with django_assert_num_queries(1):
+            response = client.get(
+                '/api/v1/titles/scores/',
+                {'id': [title['id'] for title in titles]}
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert [item['id'] for item in data] == sorted(
+            title['id'] for title in titles
+        ), 'Проверьте, что гистограммы приходят для всех произведений'
+        assert sum(data[0]['scores'].values()) == len(reviews)
+        assert client.get('/api/v1/titles/scores/').status_code == 400
+
+    def test_03_score_fields(self):
+        from reviews.models import RATE_CHOICES, SCORE_FIELDS, Title
+
+        assert len(SCORE_FIELDS) == len(RATE_CHOICES)
+        for field in SCORE_FIELDS:
+            assert Title._meta.get_field(field).default == 0, (
+                f'Проверьте, что у произведения есть поле `{field}`'
+            )
@@ -0,0 +1,101 @@
+import pytest
+
+from .common import auth_client, create_comments
+
+
+class Test23Moderation:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_moderation_access(self, client, admin_client, admin):
+        _, _, _, user, moderator = create_comments(admin_client, admin)
+        url = '/api/v1/moderation/reviews/'
+        data = {'action': 'hide', 'author': user.username}
+        assert client.post(url, data=data).status_code == 401
+        assert auth_client(user).post(url, data=data).status_code == 403, (
+            'Проверьте, что массовая модерация недоступна пользователю'
+        )
+        response = auth_client(moderator).post(url, data={'action': 'hide'})
+        assert response.status_code == 400, (
+            'Проверьте, что без фильтров запрос модерации отклоняется'
+        )
+        response = auth_client(moderator).post(
+            '/api/v1/moderation/titles/', data=data
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_hide_reviews(self, client, admin_client, admin):
+        _, reviews, titles, user, moderator = create_comments(
+            admin_client, admin
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = auth_client(moderator).post(
+            '/api/v1/moderation/reviews/',
+            data={'action': 'hide', 'author': admin.username},
+            format='json',
+        )
+        assert response.status_code == 200
+        assert response.json() == {'count': 1}
+        rest = [
+            review for review in reviews
+            if review['author'] != admin.username
+        ]
+        title = client.get(title_url).json()
+        assert title['review_count'] == len(rest)
+        assert title['rating'] == sum(
+            review['score'] for review in rest
+        ) // len(rest), (
+            'Проверьте, что скрытые отзывы не учитываются в рейтинге'
+        )
+        response = client.get(f'{title_url}reviews/')
+        assert {review['id'] for review in response.json()['results']} == {
+            review['id'] for review in rest
+        }, 'Проверьте, что скрытые отзывы не выводятся'
+        response = client.get(f'{title_url}reviews/{reviews[0]["id"]}/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_comments(self, client, admin_client, admin):
+        from reviews.models import Comments
+
+        comments, reviews, titles, _, moderator = create_comments(
+            admin_client, admin
+        )
+        response = auth_client(moderator).post(
+            '/api/v1/moderation/comments/',
+            data={
+                'action': 'delete',
+                'ids': [comment['id'] for comment in comments[:-1]],
+                'title': titles[0]['id'],
+            },
+            format='json',
+        )
+        assert response.json() == {'count': len(comments) - 1}
+        assert Comments.objects.count() == 1, (
+            'Проверьте, что комментарии удаляются из базы'
+        )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        assert response.json()['comment_count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_delete_reviews(self, client, admin_client, admin):
+        from reviews.models import Comments, Review
+
+        _, reviews, titles, _, moderator = create_comments(
+            admin_client, admin
+        )
+        response = auth_client(moderator).post(
+            '/api/v1/moderation/reviews/',
+            data={'action': 'delete', 'title': titles[0]['id']},
+            format='json',
+        )
+        assert response.json() == {'count': len(reviews)}
+        assert not Review.objects.exists()
+        assert not Comments.objects.exists(), (
+            'Проверьте, что вместе с отзывами удаляются их комментарии'
+        )
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['rating'] is None
+        assert title['review_count'] == 0
@@ -0,0 +1,110 @@
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments
+
+
+class Test24Purge:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_soft_delete(self, client, admin_client, admin):
+        from reviews.models import Comments, Review, Title
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(f'{title_url}reviews/')['ETag']
+        response = admin_client.delete(title_url)
+        assert response.status_code == 204
+        assert client.get(title_url).status_code == 404, (
+            'Проверьте, что удалённое произведение сразу скрывается'
+        )
+        assert client.get(f'{title_url}reviews/').status_code == 404
+        response = client.get(f'{title_url}reviews/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 404, (
+            'Проверьте, что ETag отзывов удалённого произведения '
+            'больше не подтверждается'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == len(
+            titles
+        ) - 1
+        assert Review.objects.count() == len(reviews), (
+            'Проверьте, что отзывы удаляются не в запросе, а командой'
+        )
+        call_command('purge_deleted', batch_size=1)
+        assert not Title.objects.filter(id=titles[0]['id']).exists()
+        assert not Review.objects.exists()
+        assert not Comments.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_user_soft_delete(self, client, admin_client, admin):
+        from reviews.models import Comments, Review, User
+
+        _, reviews, titles, user, _ = create_comments(admin_client, admin)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert admin_client.get(
+            f'/api/v1/users/{user.username}/'
+        ).status_code == 404, (
+            'Проверьте, что удалённый пользователь сразу скрывается'
+        )
+        User.objects.filter(id=user.id).update(confirmation_code='123456')
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': '123456'
+        })
+        assert response.status_code == 404, (
+            'Проверьте, что удалённый пользователь не получает токен'
+        )
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(f'{title_url}reviews/')
+        assert user.username not in {
+            review['author'] for review in response.json()['results']
+        }, 'Проверьте, что отзывы удалённого пользователя не выводятся'
+        rest = [
+            review for review in reviews if review['author'] != user.username
+        ]
+        for _ in range(2):
+            title = client.get(title_url).json()
+            assert title['review_count'] == len(rest)
+            assert title['rating'] == sum(
+                review['score'] for review in rest
+            ) // len(rest), (
+                'Проверьте, что рейтинг не учитывает отзывы '
+                'удалённого пользователя ни до, ни после очистки'
+            )
+            call_command('purge_deleted')
+        assert not User.objects.filter(id=user.id).exists()
+        assert not Review.objects.filter(author_id=user.id).exists()
+        assert not Comments.objects.filter(author_id=user.id).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_review_author_comments(
+            self, client, admin_client, admin
+    ):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        comments_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+            'comments/'
+        )
+        response = admin_client.post(comments_url, data={'text': 'Ответ'})
+        assert response.status_code == 201
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = client.get(comments_url)
+        assert response.status_code == 404 or not response.json()[
+            'results'
+        ], (
+            'Проверьте, что комментарии к отзыву удалённого пользователя '
+            'не выводятся'
+        )
+        response = admin_client.post(comments_url, data={'text': 'Ещё'})
+        assert response.status_code == 404, (
+            'Проверьте, что к отзыву удалённого пользователя нельзя '
+            'оставить комментарий'
+        )
+        response = admin_client.get('/api/v1/export/comments/')
+        content = b''.join(response.streaming_content).decode()
+        assert 'Ответ' not in content, (
+            'Проверьте, что выгрузка не содержит комментарии к отзыву '
+            'удалённого пользователя'
+        )
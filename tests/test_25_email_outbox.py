@@ -0,0 +1,75 @@
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+class Test25EmailOutbox:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_email(self, client, settings):
+        from reviews.models import OutboxEmail
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        data = {'email': 'queue@yamdb.fake', 'username': 'queue'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        assert OutboxEmail.objects.filter(
+            recipient=data['email'], sent__isnull=True
+        ).exists(), 'Проверьте, что письмо попадает в очередь'
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [data['email']]
+        assert not OutboxEmail.objects.filter(sent__isnull=True).exists(), (
+            'Проверьте, что отправленное письмо отмечается в очереди'
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо не отправляется повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry_with_backoff(self, settings):
+        from reviews.models import OutboxEmail
+        from reviews.outbox import enqueue_email
+
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_BACKEND = (
+            'tests.test_25_email_outbox.FailingBackend'
+        )
+        email = enqueue_email('Тема', 'Текст', 'retry@yamdb.fake',
+                              'webmaster@localhost')
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent is None
+        assert email.attempts == 1
+        assert 'Сервер недоступен' in email.last_error
+        first_delay = email.next_attempt - email.created
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.attempts == 1, (
+            'Проверьте, что неудачное письмо откладывается до next_attempt'
+        )
+        OutboxEmail.objects.update(next_attempt=email.created)
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.attempts == 2
+        assert email.next_attempt - email.created > first_delay, (
+            'Проверьте, что задержка растёт с каждой попыткой'
+        )
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        OutboxEmail.objects.update(next_attempt=email.created)
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
@@ -0,0 +1,150 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import auth_client, create_users_api
+
+
+def claims_client(user):
+    from api.tokens import RoleAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+def user_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']
+    ]
+
+
+class Test26ClaimsAuth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_claims_without_user_query(
+            self, admin, django_assert_max_num_queries
+    ):
+        client = claims_client(admin)
+        with django_assert_max_num_queries(10) as context:
+            response = client.post(
+                '/api/v1/categories/', data={'name': 'Кино', 'slug': 'kino'}
+            )
+        assert response.status_code == 201
+        assert not user_queries(context), (
+            'Проверьте, что права проверяются по утверждениям токена '
+            'без запроса к таблице пользователей'
+        )
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['username'] == admin.username, (
+            'Проверьте, что полная запись пользователя доступна по запросу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_user_cache(
+            self, admin_client, admin, django_assert_max_num_queries
+    ):
+        user, _ = create_users_api(admin_client)
+        client = claims_client(user)
+        # токен без роли проверяется по записи из кэша
+        legacy_client = auth_client(user)
+        legacy_client.get('/api/v1/users/me/')
+        with django_assert_max_num_queries(10) as context:
+            response = legacy_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert not user_queries(context), (
+            'Проверьте, что пользователь берётся из кэша в памяти'
+        )
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'bio': 'Новое'}
+        )
+        assert legacy_client.get('/api/v1/users/me/').json()['bio'] == (
+            'Новое'
+        ), 'Проверьте, что кэш сбрасывается при сохранении пользователя'
+        assert client.get('/api/v1/users/me/').json()['bio'] == 'Новое'
+        response = client.patch('/api/v1/users/me/', data={'bio': 'Своё'})
+        assert response.json()['bio'] == 'Своё'
+        assert legacy_client.get('/api/v1/users/me/').json()['bio'] == (
+            'Своё'
+        ), 'Проверьте, что изменения профиля сбрасывают кэш'
+        response = client.get('/api/v1/users/')
+        assert response.status_code == 403, (
+            'Проверьте, что роль из токена учитывается в правах'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_deleted_user_token(
+            self, admin_client, moderator, django_user_model
+    ):
+        chief = django_user_model.objects.create_user(
+            username='chief', email='chief@yamdb.fake', role='admin'
+        )
+        client = claims_client(chief)
+        assert client.get('/api/v1/users/').status_code == 200
+        admin_client.delete('/api/v1/users/chief/')
+        response = client.get('/api/v1/users/')
+        assert response.status_code == 401, (
+            'Проверьте, что токен удалённого пользователя не принимается'
+        )
+        client = claims_client(moderator)
+        django_user_model.soft_delete(moderator.id)
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что токен помеченного удалённым пользователя '
+            'не принимается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_demoted_user_token(
+            self, admin_client, admin, moderator, django_user_model
+    ):
+        client = claims_client(admin)
+        admin_client.patch(
+            f'/api/v1/users/{admin.username}/', data={'bio': 'Новое'}
+        )
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что правка профиля не отзывает токены'
+        )
+        old_client = claims_client(moderator)
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'}
+        )
+        response = old_client.patch(
+            '/api/v1/users/me/', data={'bio': 'Своё'}
+        )
+        assert response.status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+        moderator.refresh_from_db()
+        assert moderator.role == 'user'
+        response = claims_client(moderator).patch(
+            '/api/v1/users/me/', data={'bio': 'Своё'}
+        )
+        assert response.json()['role'] == 'user'
+        moderator.refresh_from_db()
+        assert moderator.role == 'user', (
+            'Проверьте, что `/users/me/` не меняет роль пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_revocation_survives_cache(
+            self, client, admin_client, moderator
+    ):
+        from django.conf import settings
+        from django.core.cache import caches
+
+        old_client = claims_client(moderator)
+        admin_client.patch(
+            f'/api/v1/users/{moderator.username}/', data={'role': 'user'}
+        )
+        for page in range(400):
+            client.get(f'/api/v1/genres/?offset={page}')
+        for alias in settings.CACHES:
+            caches[alias].clear()
+        response = old_client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что отзыв токенов не теряется при вытеснении '
+            'или очистке кэша'
+        )
@@ -0,0 +1,66 @@
+import jwt
+import pytest
+from rest_framework.test import APIClient
+
+
+class Test27Tokens:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_get_token(self, client):
+        from reviews.models import User
+
+        data = {'email': 'token@yamdb.fake', 'username': 'token_user'}
+        client.post('/api/v1/auth/signup/', data=data)
+        user = User.objects.get(username=data['username'])
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': user.confirmation_code,
+        })
+        assert response.status_code == 200
+        token = response.json()['token']
+        assert jwt.get_unverified_header(token)['kid'] == 'primary', (
+            'Проверьте, что токен подписан ключом с kid в заголовке'
+        )
+        payload = jwt.decode(token, options={'verify_signature': False})
+        assert payload['user_id'] == user.id, (
+            'Проверьте, что токен выпускается для проверенного пользователя'
+        )
+        assert payload['role'] == user.role
+        api_client = APIClient()
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = api_client.get('/api/v1/users/me/')
+        assert response.json()['username'] == user.username
+
+    def test_02_key_rotation(self):
+        from rest_framework_simplejwt.exceptions import TokenBackendError
+
+        from api.tokens import KeyRotationTokenBackend
+
+        payload = {'user_id': 1}
+        old = KeyRotationTokenBackend('HS256', {'old': 'a'}, 'old', 'x')
+        token = old.encode(payload)
+        rotated = KeyRotationTokenBackend(
+            'HS256', {'old': 'a', 'new': 'b'}, 'new', 'x'
+        )
+        assert rotated.decode(token) == payload, (
+            'Проверьте, что после смены ключа старые токены действуют'
+        )
+        assert jwt.get_unverified_header(
+            rotated.encode(payload)
+        )['kid'] == 'new'
+        retired = KeyRotationTokenBackend('HS256', {'new': 'b'}, 'new', 'x')
+        with pytest.raises(TokenBackendError):
+            retired.decode(token)
+        legacy = jwt.encode(payload, 'x', algorithm='HS256')
+        assert retired.decode(legacy) == payload, (
+            'Проверьте, что токены без kid проверяются прежним ключом'
+        )
+        with pytest.raises(TokenBackendError):
+            retired.decode('не.токен.вовсе')
+        strict = KeyRotationTokenBackend('HS256', {'new': 'b'}, 'new', None)
+        with pytest.raises(TokenBackendError):
+            strict.decode(legacy)
+        assert strict.decode(strict.encode(payload)) == payload
+        unsigned = jwt.encode(payload, 'b', algorithm='HS256')
+        with pytest.raises(TokenBackendError):
+            strict.decode(unsigned)
@@ -0,0 +1,65 @@
+import pytest
+
+
+class Test28Throttling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_identity_budget(self, client, django_assert_num_queries):
+        data = {'username': 'storm'}
+        for _ in range(5):
+            assert client.post(self.url_signup, data=data).status_code == 400
+        with django_assert_num_queries(0):
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что повторные запросы с одним username '
+            'ограничиваются до обращения к базе'
+        )
+        assert int(response['Retry-After']) > 0
+        response = client.post(
+            self.url_token, data=data, REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == 429, (
+            'Проверьте, что бюджет username не зависит от IP-адреса'
+        )
+        response = client.post(self.url_signup, data={'username': 'other'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ip_budget(self, client):
+        for number in range(20):
+            response = client.post(
+                self.url_signup, data={'username': f'bot{number}'}
+            )
+            assert response.status_code == 400
+        response = client.post(self.url_signup, data={'username': 'bot'})
+        assert response.status_code == 429, (
+            'Проверьте, что запросы с одного IP-адреса ограничиваются'
+        )
+        response = client.post(
+            self.url_signup, data={'username': 'bot'},
+            HTTP_X_FORWARDED_FOR='10.0.0.3'
+        )
+        assert response.status_code == 429, (
+            'Проверьте, что подставленный X-Forwarded-For '
+            'не сбрасывает ограничение по IP-адресу'
+        )
+        response = client.post(
+            self.url_signup, data={'username': 'bot'},
+            REMOTE_ADDR='10.0.0.2'
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_shared_store(self, client, settings):
+        from django.core.cache import cache
+
+        settings.THROTTLE_SHARED = True
+        data = {'username': 'shared'}
+        for _ in range(5):
+            client.post(self.url_token, data=data)
+        assert client.post(self.url_token, data=data).status_code == 429
+        assert cache.get('throttle:auth_identity:username:shared'), (
+            'Проверьте, что с THROTTLE_SHARED корзины хранятся в кэше'
+        )
@@ -0,0 +1,60 @@
+import pytest
+
+
+class Test29UserSearch:
+    url = '/api/v1/users/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_prefix_search(self, admin_client, django_user_model):
+        django_user_model.objects.create_user(
+            username='Storm', email='Rain@yamdb.fake'
+        )
+        django_user_model.objects.create_user(
+            username='cloud', email='storm@yamdb.fake'
+        )
+        django_user_model.objects.create_user(
+            username='thunderstorm', email='thunder@yamdb.fake'
+        )
+        response = admin_client.get(f'{self.url}?search=STO')
+        assert response.status_code == 200
+        assert {user['username'] for user in response.json()['results']} == {
+            'Storm', 'cloud'
+        }, (
+            'Проверьте, что поиск находит пользователей по началу '
+            'username или email без учёта регистра'
+        )
+        response = admin_client.get(f'{self.url}?search=rain')
+        assert [user['username'] for user in response.json()['results']] == [
+            'Storm'
+        ]
+        user = django_user_model.objects.get(username='cloud')
+        user.username = 'Sky'
+        user.save()
+        response = admin_client.get(f'{self.url}?search=sk')
+        assert [user['username'] for user in response.json()['results']] == [
+            'Sky'
+        ], 'Проверьте, что поля поиска обновляются при сохранении'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_capped_count(self, admin_client, django_user_model, settings):
+        from api.pagination import CountedLimitOffsetPagination
+
+        for number in range(8):
+            django_user_model.objects.create_user(
+                username=f'fan{number}', email=f'fan{number}@yamdb.fake'
+            )
+        cap = CountedLimitOffsetPagination.count_cap
+        CountedLimitOffsetPagination.count_cap = 3
+        try:
+            response = admin_client.get(f'{self.url}?search=fan&limit=2')
+            data = response.json()
+            assert data['count'] == 5 and data['count_exact'] is False, (
+                'Проверьте, что при поиске строки считаются только '
+                'до порога после текущей страницы'
+            )
+            assert len(data['results']) == 2
+            response = admin_client.get(f'{self.url}?search=fan&limit=5')
+            data = response.json()
+            assert data['count'] == 8 and 'count_exact' not in data
+        finally:
+            CountedLimitOffsetPagination.count_cap = cap
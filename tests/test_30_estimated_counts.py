@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+
+from .common import create_reviews, create_titles
+
+
+class Test30EstimatedCounts:
+    url = '/api/v1/titles/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_unfiltered_estimate(
+            self, client, admin_client, settings, django_assert_num_queries
+    ):
+        create_titles(admin_client)
+        settings.PAGINATION_COUNT_CAP = 1
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        try:
+            with django_assert_num_queries(3) as context:
+                response = client.get(self.url)
+            data = response.json()
+            assert data['count'] == 2 and data['count_exact'] is False, (
+                'Проверьте, что для большого списка без фильтров '
+                'число строк берётся из статистики sqlite_stat1'
+            )
+            assert not any(
+                'COUNT(' in query['sql'] for query in context.captured_queries
+            )
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM sqlite_stat1')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_filtered_cap(self, client, admin_client):
+        from api.pagination import CountedPageNumberPagination
+
+        titles, _, _ = create_titles(admin_client)
+        for number in range(4):
+            admin_client.post(self.url, data={
+                'name': f'Поток {number}', 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            })
+        cap = CountedPageNumberPagination.count_cap
+        page_size = CountedPageNumberPagination.page_size
+        CountedPageNumberPagination.count_cap = 1
+        CountedPageNumberPagination.page_size = 2
+        try:
+            response = client.get(f'{self.url}?name=Поток')
+            data = response.json()
+            assert data['count'] == 3 and data['count_exact'] is False, (
+                'Проверьте, что отфильтрованный список считается '
+                'только до порога после текущей страницы'
+            )
+            assert len(data['results']) == 2
+            response = client.get(f'{self.url}?name=Поток&page=2')
+            data = response.json()
+            assert data['count'] == 4 and 'count_exact' not in data
+        finally:
+            CountedPageNumberPagination.count_cap = cap
+            CountedPageNumberPagination.page_size = page_size
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_pages_past_estimate(
+            self, client, admin_client, settings, django_user_model
+    ):
+        from api.pagination import CountedPageNumberPagination
+
+        titles, _, _ = create_titles(admin_client)
+        for number in range(4):
+            django_user_model.objects.create_user(
+                username=f'fan{number}', email=f'fan{number}@yamdb.fake'
+            )
+            if number == 1:
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+        settings.PAGINATION_COUNT_CAP = 1
+        for number in range(6):
+            admin_client.post(self.url, data={
+                'name': f'Поток {number}', 'year': 2000,
+                'genre': titles[0]['genre'],
+                'category': titles[0]['category'],
+            })
+        page_size = CountedPageNumberPagination.page_size
+        CountedPageNumberPagination.page_size = 2
+        try:
+            pages = []
+            url = self.url
+            while url:
+                data = client.get(url).json()
+                assert data['count'] == 2 and data['count_exact'] is False
+                pages.append(data['results'])
+                url = data['next']
+            assert len(pages) == 4 and len(pages[-1]) == 2, (
+                'Проверьте, что страницы за пределами оценки числа '
+                'строк доступны по ссылкам `next`'
+            )
+            assert client.get(f'{self.url}?page=5').status_code == 404
+            response = admin_client.get('/api/v1/users/?limit=2&offset=2')
+            data = response.json()
+            assert data['count'] == 3 and data['next'] is not None
+            response = admin_client.get(data['next'])
+            data = response.json()
+            assert len(data['results']) == 1 and data['next'] is None
+        finally:
+            CountedPageNumberPagination.page_size = page_size
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM sqlite_stat1')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_review_count_matches_rows(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        data = client.get(
+            f'{self.url}{titles[0]["id"]}/reviews/'
+        ).json()
+        assert data['count'] == len(data['results']) == len(reviews) - 1, (
+            'Проверьте, что число отзывов без фильтров совпадает '
+            'с отзывами в списке'
+        )
+        assert 'count_exact' not in data
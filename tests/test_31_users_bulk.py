@@ -0,0 +1,61 @@
+import pytest
+
+
+class Test31UsersBulk:
+    url = '/api/v1/users/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_users_bulk_create(
+            self, admin_client, django_user_model,
+            django_assert_max_num_queries
+    ):
+        data = [
+            {
+                'username': f'Partner{number}',
+                'email': f'Partner{number}@yamdb.fake',
+                'role': 'user',
+            }
+            for number in range(50)
+        ]
+        # администратор, занятые username и email, BEGIN и вставка
+        with django_assert_max_num_queries(5):
+            response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что POST списка пользователей на `/api/v1/users/` '
+            'возвращает статус 201'
+        )
+        assert [user['username'] for user in response.json()] == [
+            user['username'] for user in data
+        ]
+        assert django_user_model.objects.filter(
+            username__startswith='Partner'
+        ).count() == 50
+        response = admin_client.get(f'{self.url}?search=partner4')
+        assert response.json()['count'] == 11, (
+            'Проверьте, что созданные списком пользователи находятся поиском'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_users_bulk_errors(
+            self, admin_client, admin, django_user_model
+    ):
+        data = [
+            {'username': 'fresh', 'email': 'fresh@yamdb.fake'},
+            {'username': admin.username, 'email': 'other@yamdb.fake'},
+            {'username': 'twin', 'email': 'fresh@yamdb.fake'},
+            {'username': 'me', 'email': 'me@yamdb.fake'},
+        ]
+        users = django_user_model.objects.count()
+        response = admin_client.post(self.url, data=data, format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}, (
+            'Проверьте, что ошибки POST списка пользователей '
+            'возвращаются для каждой строки'
+        )
+        assert set(errors[1]) == {'username'}
+        assert set(errors[2]) == {'email'}, (
+            'Проверьте, что повторы внутри списка считаются ошибкой'
+        )
+        assert set(errors[3]) == {'username'}
+        assert django_user_model.objects.count() == users